@@ -11,8 +11,6 @@ import math
 from contextlib import contextmanager
 from typing import Any, Dict, Iterable, Iterator, Mapping, Optional
 
-from py_clob_client_v2 import BookParams
-
 from polybot_observability import (
     ClobReconciliationPhaseError,
     ClobResponseContractError,
@@ -281,6 +279,9 @@ class ClobClientWrapper:
         chunk_count = 0
         failed_chunks = 0
 
+        # 다른 v2 타입처럼 사용할 때만 import 한다 (eth_account 등 로딩이 무겁다)
+        from py_clob_client_v2 import BookParams
+
         for offset in range(0, len(unique_tokens), self.MAX_MIDPOINT_BATCH_SIZE):
             chunk = unique_tokens[offset : offset + self.MAX_MIDPOINT_BATCH_SIZE]
             chunk_count += 1
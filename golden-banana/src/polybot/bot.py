@@ -6,7 +6,7 @@ from .config import BotConfig
 from .api.gamma_client import GammaClient
 from .api.clob_client import ClobClientWrapper
 from .strategy.scanner import MarketScanner
-from .strategy.trader import Trader
+from .strategy.trader import Trader, order_holdings_by_exit_proximity
 from .db.models import init_database
 from .db.repository import TradeRepository
 
@@ -42,6 +42,7 @@ class PolymarketBot:
                 ),
                 minimum_latest_points=long_window + 10,
             ),
+            simulation_mode=config.simulation_mode,
         )
 
         # Initialize API clients
@@ -82,13 +83,14 @@ class PolymarketBot:
         """
         session = self.Session()
         repo = TradeRepository(session)
+        trading = self.config.trading
 
         # Scanner needs repo for momentum calculations
-        scanner = MarketScanner(self.gamma, self.config.trading, repo)
-        trader = Trader(repo, self.clob, self.config.trading)
+        scanner = MarketScanner(self.gamma, trading, repo)
+        trader = Trader(repo, self.clob, trading)
 
         stats = {
-            "lifecycle_mode": self.config.trading.lifecycle_mode,
+            "lifecycle_mode": trading.lifecycle_mode,
             "snapshots_saved": 0,
             "checked_holdings": 0,
             "sold": 0,
@@ -98,13 +100,15 @@ class PolymarketBot:
 
         try:
             # Log momentum configuration at cycle start
-            if self.config.trading.momentum.enabled:
+            momentum = trading.momentum
+            if momentum.enabled:
                 logger.info(
-                    f"모멘텀 설정 - 활성화: True, "
-                    f"골든크로스: {self.config.trading.momentum.golden_cross_threshold}, "
-                    f"데드크로스: {self.config.trading.momentum.dead_cross_threshold}, "
-                    f"단기윈도우: {self.config.trading.momentum.short_window}, "
-                    f"장기윈도우: {self.config.trading.momentum.long_window}"
+                    "모멘텀 설정 - 활성화: True, 골든크로스: %s, 데드크로스: %s, "
+                    "단기윈도우: %s, 장기윈도우: %s",
+                    momentum.golden_cross_threshold,
+                    momentum.dead_cross_threshold,
+                    momentum.short_window,
+                    momentum.long_window,
                 )
             else:
                 logger.info("모멘텀 설정 - 활성화: False (확률 조건만 사용)")
@@ -116,7 +120,7 @@ class PolymarketBot:
             logger.info("=== Phase 0: 마켓 스냅샷 저장 ===")
             stats["snapshots_saved"] = scanner.save_market_snapshots(markets)
 
-            lifecycle_mode = self.config.trading.lifecycle_mode
+            lifecycle_mode = trading.lifecycle_mode
 
             if lifecycle_mode == "archive_only":
                 logger.warning(
@@ -129,10 +133,17 @@ class PolymarketBot:
                 stats["checked_holdings"] = len(holdings)
 
                 if holdings:
+                    # dead cross 확인용 스냅샷 창도 포지션마다 묻지 않고 한 번에 읽는다
+                    trader.prefetch_momentum_windows(
+                        trade.condition_id for trade in holdings
+                    )
                     with self.clob.midpoint_snapshot(
                         trade.token_id for trade in holdings
-                    ):
-                        for trade in holdings:
+                    ) as prices:
+                        # 청산선에 가까운 포지션부터 매도 판단 (중간에 끊겨도 급한 것 먼저)
+                        for trade in order_holdings_by_exit_proximity(
+                            holdings, prices, trading
+                        ):
                             if trader.execute_sell(trade):
                                 stats["sold"] += 1
 
@@ -144,14 +155,30 @@ class PolymarketBot:
 
                 # Phase 3: Execute buys
                 logger.info("=== Phase 3: 매수 실행 ===")
+                pending = []
+                # batch 결과는 trader도 기억해 execute_buy의 재확인에 그대로 쓴다
+                traded = (
+                    trader.prefetch_traded_ids(
+                        [candidate["condition_id"] for candidate in candidates]
+                    )
+                    if candidates
+                    else set()
+                )
                 for candidate in candidates:
                     # Skip if already traded
-                    if repo.is_already_traded(candidate["condition_id"]):
-                        logger.info(f"이미 거래한 시장 skip: {candidate['condition_id']}")
+                    if candidate["condition_id"] in traded:
+                        logger.info("이미 거래한 시장 skip: %s", candidate["condition_id"])
                         continue
+                    pending.append(candidate)
 
-                    if trader.execute_buy(candidate):
-                        stats["bought"] += 1
+                if pending:
+                    # 매수 직전 가격 재확인도 후보별 왕복 대신 batch 한 번으로 끝낸다
+                    with self.clob.midpoint_snapshot(
+                        candidate["token_id"] for candidate in pending
+                    ):
+                        for candidate in pending:
+                            if trader.execute_buy(candidate):
+                                stats["bought"] += 1
             else:
                 logger.warning(
                     "=== Phase 2/3 건너뜀: "
@@ -162,16 +189,17 @@ class PolymarketBot:
             logger.info("=== Phase 4: 오래된 스냅샷 정리 ===")
             repo.cleanup_old_snapshots(days=7)
 
-            # Log statistics
-            db_stats = repo.get_stats()
-            logger.info(f"=== 사이클 완료 ===")
-            logger.info(f"스냅샷 저장: {stats['snapshots_saved']}개")
-            logger.info(f"보유 포지션 확인: {stats['checked_holdings']}개")
-            logger.info(f"매도: {stats['sold']}건")
-            logger.info(f"매수 후보: {stats['buy_candidates']}개")
-            logger.info(f"매수: {stats['bought']}건")
-            logger.info(f"총 포지션: {db_stats['holding']}개")
-            logger.info(f"총 P&L: ${db_stats['total_pnl']:.4f}")
+            # Log statistics (집계 쿼리는 로그가 실제로 찍힐 때만 실행)
+            if logger.isEnabledFor(logging.INFO):
+                db_stats = repo.get_stats()
+                logger.info("=== 사이클 완료 ===")
+                logger.info("스냅샷 저장: %d개", stats["snapshots_saved"])
+                logger.info("보유 포지션 확인: %d개", stats["checked_holdings"])
+                logger.info("매도: %d건", stats["sold"])
+                logger.info("매수 후보: %d개", stats["buy_candidates"])
+                logger.info("매수: %d건", stats["bought"])
+                logger.info("총 포지션: %d개", db_stats["holding"])
+                logger.info("총 P&L: $%.4f", db_stats["total_pnl"])
 
             return stats
 
@@ -209,7 +237,7 @@ class PolymarketBot:
 
         try:
             stats = repo.get_stats()
-            holdings = repo.get_holding_trades()
+            holdings = repo.get_holding_trades_summary()
 
             return {
                 "job_name": self.config.job_name,
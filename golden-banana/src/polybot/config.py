@@ -14,6 +14,12 @@ from polybot_observability.config_contract import (
 
 LIFECYCLE_MODES = frozenset({"active", "close_only", "archive_only"})
 
+# libyaml이 설치돼 있으면 C 구현 SafeLoader로 파싱한다 (동작은 safe_load와 동일)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml 없이 설치된 PyYAML
+    from yaml import SafeLoader as _YamlLoader
+
 
 def _get_config_value(
     env_key: str,
@@ -87,7 +93,7 @@ def _get_lifecycle_mode(yaml_value) -> str:
     return normalized
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MomentumConfig:
     """모멘텀 전략 설정."""
     enabled: bool = True
@@ -98,7 +104,7 @@ class MomentumConfig:
     require_positive_long_momentum: bool = True  # 장기 모멘텀 양수 필수
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradingConfig:
     """Trading strategy configuration."""
     buy_threshold: float = 0.85           # 변경: 0.80 → 0.85
@@ -116,7 +122,7 @@ class TradingConfig:
     lifecycle_mode: str = "active"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ApiConfig:
     """API authentication configuration."""
     private_key: str
@@ -127,7 +133,7 @@ class ApiConfig:
     chain_id: int = 137  # Polygon Mainnet
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BotConfig:
     """Complete bot configuration."""
     trading: TradingConfig
@@ -217,7 +223,7 @@ def load_config(
     config_file = Path(config_path)
     if config_file.exists():
         with open(config_file, encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
+            cfg = yaml.load(f, Loader=_YamlLoader) or {}
     else:
         cfg = {}
 
@@ -1,10 +1,12 @@
 """SQLite database models for trade tracking."""
 import enum
 from datetime import datetime
+from pathlib import Path
 from sqlalchemy import (
     Column, Integer, String, Float, DateTime, Boolean, Enum, create_engine, text
 )
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import NullPool
 from polybot_observability import SQLiteMaintenanceRequirements, prepare_database
 
 Base = declarative_base()
@@ -108,11 +110,16 @@ class SkippedMarket(Base):
 def init_database(
     db_path: str,
     maintenance_requirements: SQLiteMaintenanceRequirements | None = None,
+    simulation_mode: bool = False,
 ) -> sessionmaker:
     """Initialize database and return session factory.
 
     Args:
         db_path: Path to SQLite database file
+        maintenance_requirements: compact-v1 bootstrap 요구 사항
+        simulation_mode: True면 연결을 풀에 보관하지 않는다 (NullPool).
+            시뮬레이션/테스트 프로세스가 fork하거나 DB 파일을 지웠다 다시
+            만들어도 오래된 연결을 재사용하지 않는다.
 
     Returns:
         SQLAlchemy sessionmaker instance
@@ -122,8 +129,17 @@ def init_database(
         "golden-banana",
         requirements=maintenance_requirements,
     )
-    engine = create_engine(f"sqlite:///{db_path}", echo=False)
-    Base.metadata.create_all(engine)
+    # compact-v1 bootstrap이 만들지 않은 새 DB도 스냅샷 정리 후 free page를
+    # 반환할 수 있게 한다. auto_vacuum은 첫 테이블 생성 전에만 바꿀 수 있다.
+    db_file = Path(db_path)
+    is_new_database = not db_file.exists() or db_file.stat().st_size == 0
+    engine_kwargs = {"poolclass": NullPool} if simulation_mode else {}
+    engine = create_engine(f"sqlite:///{db_path}", echo=False, **engine_kwargs)
+    # PRAGMA와 첫 테이블 생성을 같은 연결에서 해야 NullPool에서도 설정이 남는다
+    with engine.begin() as conn:
+        if is_new_database:
+            conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+        Base.metadata.create_all(conn)
     with engine.connect() as conn:
         try:
             conn.execute(text("ALTER TABLE trades ADD COLUMN market_tags TEXT"))
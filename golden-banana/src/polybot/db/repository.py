@@ -2,13 +2,23 @@
 import logging
 from polybot_observability import compact_maintenance_active
 from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import delete, func, select, text
 from .models import Trade, TradeStatus, SkippedMarket, MarketSnapshot
 
 logger = logging.getLogger(__name__)
 
+# 한 번의 거대한 DELETE는 끝날 때까지 SQLite write lock을 쥔다. 같은 DB를 쓰는
+# 다른 job이 기다리지 않도록 배치마다 커밋해 lock을 짧게 끊는다.
+SNAPSHOT_DELETE_BATCH_SIZE = 5000
+# free page가 이만큼 쌓였을 때만 일부를 반환한다 (auto_vacuum=INCREMENTAL DB 한정).
+# 정리는 매 사이클 조금씩 지우므로 호출당 삭제 수가 아니라 DB에 누적된 freelist로 판단한다.
+SNAPSHOT_VACUUM_MIN_FREE_PAGES = 1000
+SNAPSHOT_VACUUM_PAGES = 1000
+# 다중 마켓 조회(스냅샷/거래 여부) 시 IN 목록 하나에 담는 condition_id 수
+SNAPSHOT_QUERY_BATCH_SIZE = 500
+
 
 class TradeRepository:
     """CRUD operations for trades."""
@@ -42,6 +52,26 @@ class TradeRepository:
         ).first()
         return skipped is not None
 
+    def get_already_traded_ids(self, condition_ids: List[str]) -> Set[str]:
+        """`is_already_traded`의 다건 버전: 거래했거나 skip된 condition_id 집합.
+
+        후보마다 trades/skipped_markets를 각각 조회하는 대신 IN 쿼리로
+        묶어 보낸다.
+        """
+        traded: Set[str] = set()
+        unique_ids = list(dict.fromkeys(condition_ids))
+        for offset in range(0, len(unique_ids), SNAPSHOT_QUERY_BATCH_SIZE):
+            chunk = unique_ids[offset:offset + SNAPSHOT_QUERY_BATCH_SIZE]
+            traded.update(self.session.execute(
+                select(Trade.condition_id).where(Trade.condition_id.in_(chunk))
+            ).scalars())
+            traded.update(self.session.execute(
+                select(SkippedMarket.condition_id).where(
+                    SkippedMarket.condition_id.in_(chunk)
+                )
+            ).scalars())
+        return traded
+
     def create_trade(self, **kwargs) -> Trade:
         """Create a new trade record."""
         trade = Trade(**kwargs)
@@ -69,6 +99,26 @@ class TradeRepository:
             Trade.status == TradeStatus.HOLDING
         ).all()
 
+    def get_holding_trades_summary(self) -> List[Any]:
+        """HOLDING 포지션의 상태 출력용 컬럼만 조회 (ORM 객체 생성 없음).
+
+        Returns:
+            id, condition_id, question, outcome, buy_price, buy_amount,
+            buy_timestamp, entry_reason 속성을 가진 행 리스트
+        """
+        return self.session.execute(
+            select(
+                Trade.id,
+                Trade.condition_id,
+                Trade.question,
+                Trade.outcome,
+                Trade.buy_price,
+                Trade.buy_amount,
+                Trade.buy_timestamp,
+                Trade.entry_reason,
+            ).where(Trade.status == TradeStatus.HOLDING)
+        ).all()
+
     def get_pending_buy_trades(self) -> List[Trade]:
         """Get all trades waiting for buy fill."""
         return self.session.query(Trade).filter(
@@ -147,6 +197,73 @@ class TradeRepository:
         # 시간순 정렬 (오래된 것 먼저)로 반환
         return list(reversed(snapshots))
 
+    def get_snapshots_for_conditions(
+        self,
+        condition_ids: List[str],
+        limit: int = 100
+    ) -> Dict[str, List[Any]]:
+        """여러 마켓의 최근 스냅샷을 한 번에 조회 (마켓별 시간순 정렬).
+
+        마켓마다 `get_snapshots_for_condition`을 부르는 N번의 왕복 대신
+        `ROW_NUMBER() OVER (PARTITION BY condition_id ...)`로 마켓별 최근
+        limit개만 남겨 한 쿼리로 가져온다. IN 목록은 SQLite 바인드 변수 한도를
+        넘지 않도록 나눠 보낸다.
+
+        Args:
+            condition_ids: 조회할 마켓 condition ID 목록
+            limit: 마켓별 최대 조회 수
+
+        Returns:
+            condition_id -> 시간순 스냅샷 행 리스트 (오래된 것 먼저).
+            각 행은 `timestamp`, `probability` 속성을 가진다. 스냅샷이 없는
+            마켓은 키가 없다.
+        """
+        result: Dict[str, List[Any]] = {}
+        unique_ids = list(dict.fromkeys(condition_ids))
+        for offset in range(0, len(unique_ids), SNAPSHOT_QUERY_BATCH_SIZE):
+            chunk = unique_ids[offset:offset + SNAPSHOT_QUERY_BATCH_SIZE]
+            ranked = select(
+                MarketSnapshot.condition_id,
+                MarketSnapshot.timestamp,
+                MarketSnapshot.probability,
+                func.row_number().over(
+                    partition_by=MarketSnapshot.condition_id,
+                    order_by=(
+                        MarketSnapshot.timestamp.desc(),
+                        MarketSnapshot.id.desc(),
+                    ),
+                ).label("recency"),
+            ).where(MarketSnapshot.condition_id.in_(chunk)).subquery()
+            rows = self.session.execute(
+                select(ranked.c.condition_id, ranked.c.timestamp, ranked.c.probability)
+                .where(ranked.c.recency <= limit)
+                .order_by(ranked.c.condition_id, ranked.c.recency.desc())
+            ).all()
+            for row in rows:
+                result.setdefault(row.condition_id, []).append(row)
+        return result
+
+    def get_snapshot_windows(
+        self,
+        condition_ids: List[str],
+        window_size: int,
+    ) -> Dict[str, List[Any]]:
+        """마켓별 최근 window_size개 스냅샷을 요청한 모든 마켓에 대해 조회.
+
+        `get_snapshots_for_conditions`의 컬럼 전용 행을 복사하지 않고 그대로
+        돌려준다. 각 행은 `timestamp`, `probability` 속성을 가진다.
+
+        Args:
+            condition_ids: 조회할 마켓 condition ID 목록
+            window_size: 마켓별 최대 조회 수
+
+        Returns:
+            condition_id -> 시간순 스냅샷 행 리스트 (오래된 것 먼저).
+            스냅샷이 없는 마켓은 빈 리스트.
+        """
+        loaded = self.get_snapshots_for_conditions(condition_ids, limit=window_size)
+        return {cid: loaded.get(cid, []) for cid in condition_ids}
+
     def get_latest_snapshot(
         self,
         condition_id: str
@@ -170,14 +287,44 @@ class TradeRepository:
         if compact_maintenance_active(self.session, "golden-banana"):
             return 0
         cutoff = datetime.utcnow() - timedelta(days=days)
-        deleted = self.session.query(MarketSnapshot).filter(
-            MarketSnapshot.timestamp < cutoff
-        ).delete()
-        self.session.commit()
+        deleted = 0
+        while True:
+            batch = select(MarketSnapshot.id).where(
+                MarketSnapshot.timestamp < cutoff
+            ).limit(SNAPSHOT_DELETE_BATCH_SIZE)
+            # 세션에 로드된 스냅샷 객체를 맞춰 볼 필요가 없는 bulk delete다
+            removed = self.session.execute(
+                delete(MarketSnapshot)
+                .where(MarketSnapshot.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.session.commit()
+            deleted += removed
+            if removed < SNAPSHOT_DELETE_BATCH_SIZE:
+                break
         if deleted > 0:
             logger.info(f"오래된 스냅샷 {deleted}개 삭제 (기준: {days}일)")
+        self._incremental_vacuum()
         return deleted
 
+    def _incremental_vacuum(self) -> None:
+        """Return a bounded number of free pages on incremental auto-vacuum DBs."""
+        mode = self.session.execute(text("PRAGMA auto_vacuum")).scalar()
+        if mode != 2:  # 2 = INCREMENTAL; NONE/FULL DB에서는 no-op이다
+            return
+        free_pages = self.session.execute(text("PRAGMA freelist_count")).scalar() or 0
+        if free_pages < SNAPSHOT_VACUUM_MIN_FREE_PAGES:
+            return
+        # incremental_vacuum은 step마다 한 페이지만 반환하는데, sqlite3 드라이버의
+        # execute는 결과 컬럼이 없는 문장을 한 번만 step한다. executescript는
+        # 끝까지 step하므로 요청한 페이지 수만큼 실제로 반환된다.
+        self.session.commit()
+        driver_connection = self.session.connection().connection.driver_connection
+        driver_connection.executescript(
+            f"PRAGMA incremental_vacuum({SNAPSHOT_VACUUM_PAGES})"
+        )
+        self.session.commit()
+
     def get_stats(self) -> Dict[str, Any]:
         """Get trading statistics."""
         total = self.session.query(func.count(Trade.id)).scalar() or 0
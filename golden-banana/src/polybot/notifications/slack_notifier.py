@@ -1,12 +1,19 @@
 """Slack notification module for sending reports."""
+import heapq
 import logging
 import os
+from types import MappingProxyType
 from typing import Dict, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# 누락된 P&L 섹션의 읽기 전용 기본값 (호출마다 빈 dict를 새로 만들지 않는다)
+_EMPTY = MappingProxyType({})
+
 
 class SlackNotifier:
     """Send formatted messages to Slack via Webhook.
@@ -27,6 +34,19 @@ class SlackNotifier:
         if not self.webhook_url:
             logger.warning("SLACK_WEBHOOK_URL 환경변수가 설정되지 않았습니다")
 
+        # 연속 전송(계정별 리포트 등)이 TLS 연결을 재사용하도록 세션을 유지한다.
+        # POST는 Retry 기본 allowed_methods에 없으므로 연결 실패만 재시도되어
+        # 메시지가 중복 게시되지 않는다.
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=4,
+                max_retries=Retry(total=3, backoff_factor=0.2),
+            ),
+        )
+
     def send_message(
         self,
         text: str,
@@ -54,7 +74,7 @@ class SlackNotifier:
             payload["blocks"] = blocks
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.webhook_url,
                 json=payload,
                 timeout=10
@@ -82,8 +102,8 @@ class SlackNotifier:
         Returns:
             True if sent successfully
         """
-        pnl_7d = summary.get("pnl_7d", {})
-        pnl_30d = summary.get("pnl_30d", {})
+        pnl_7d = summary.get("pnl_7d", _EMPTY)
+        pnl_30d = summary.get("pnl_30d", _EMPTY)
         positions = summary.get("positions", [])
         total_value = summary.get("total_value", 0)
 
@@ -96,8 +116,9 @@ class SlackNotifier:
         else:
             color = "warning"  # Yellow
 
-        # Format timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Format timestamp (본문 표기와 Slack ts가 같은 시각을 쓰도록 한 번만 읽는다)
+        now = datetime.now()
+        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
 
         # Build attachment
         attachment = {
@@ -143,16 +164,17 @@ class SlackNotifier:
                 }
             ],
             "footer": f"Polymarket Bot • {account_name}",
-            "ts": int(datetime.now().timestamp())
+            "ts": int(now.timestamp())
         }
 
         # Add top positions if any
         if positions:
-            top_positions = sorted(
+            # 전체 정렬 없이 상위 3개만 고른다 (sorted(..., reverse=True)[:3]과 동일)
+            top_positions = heapq.nlargest(
+                3,
                 positions,
-                key=lambda p: abs(float(p.get("pnl", 0))),
-                reverse=True
-            )[:3]
+                key=lambda p: abs(float(p.get("pnl", 0)))
+            )
 
             positions_text = "\n".join([
                 f"• {pos.get('outcome', 'N/A')}: ${pos.get('value', 0):.2f} "
@@ -183,15 +205,36 @@ class SlackNotifier:
         Returns:
             True if sent successfully
         """
-        # Calculate totals
-        total_value = sum(r.get("total_value", 0) for r in reports.values())
-        total_positions = sum(r.get("num_positions", 0) for r in reports.values())
-        total_pnl_7d = sum(
-            r.get("pnl_7d", {}).get("total_pnl", 0) for r in reports.values()
-        )
-        total_pnl_30d = sum(
-            r.get("pnl_30d", {}).get("total_pnl", 0) for r in reports.values()
-        )
+        # Calculate totals and individual account attachments in one pass
+        total_value = 0
+        total_positions = 0
+        total_pnl_7d = 0
+        total_pnl_30d = 0
+        account_attachments = []
+        for account_name, summary in reports.items():
+            account_value = summary.get("total_value", 0)
+            account_pnl_7d = summary.get("pnl_7d", _EMPTY).get("total_pnl", 0)
+            total_value += account_value
+            total_positions += summary.get("num_positions", 0)
+            total_pnl_7d += account_pnl_7d
+            total_pnl_30d += summary.get("pnl_30d", _EMPTY).get("total_pnl", 0)
+
+            account_attachments.append({
+                "color": "#36a64f" if account_pnl_7d >= 0 else "#ff0000",
+                "author_name": account_name.upper(),
+                "fields": [
+                    {
+                        "title": "Value",
+                        "value": f"${account_value:.2f}",
+                        "short": True
+                    },
+                    {
+                        "title": "7d P&L",
+                        "value": f"${account_pnl_7d:+.2f}",
+                        "short": True
+                    }
+                ]
+            })
 
         # Main summary attachment
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -224,29 +267,6 @@ class SlackNotifier:
             "footer": "Polymarket Bot • Multi-Account Summary"
         }
 
-        # Individual account attachments
-        account_attachments = []
-        for account_name, summary in reports.items():
-            pnl_7d = summary.get("pnl_7d", {})
-            total_pnl = pnl_7d.get("total_pnl", 0)
-
-            account_attachments.append({
-                "color": "#36a64f" if total_pnl >= 0 else "#ff0000",
-                "author_name": account_name.upper(),
-                "fields": [
-                    {
-                        "title": "Value",
-                        "value": f"${summary.get('total_value', 0):.2f}",
-                        "short": True
-                    },
-                    {
-                        "title": "7d P&L",
-                        "value": f"${total_pnl:+.2f}",
-                        "short": True
-                    }
-                ]
-            })
-
         return self.send_message(
             text=f"Daily Report - Total: ${total_value:.2f} (7d: ${total_pnl_7d:+.2f})",
             attachments=[summary_attachment] + account_attachments
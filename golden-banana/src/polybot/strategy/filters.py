@@ -1,5 +1,6 @@
 """Market filtering functions."""
-from typing import List, Dict
+import re
+from typing import Collection, Dict, List, Optional, Pattern
 
 # Sports-related keywords for filtering
 SPORTS_KEYWORDS = [
@@ -22,7 +23,68 @@ SPORTS_KEYWORDS = [
 ]
 
 
-def is_sports_market(market: Dict, excluded_categories: List[str]) -> bool:
+def _substring_pattern(keywords) -> Optional[Pattern]:
+    """키워드 중 하나라도 부분 문자열로 포함되면 매치하는 단일 정규식.
+
+    기존 `keyword in text` 의미를 그대로 유지하려고 단어 경계(\\b)는 두지 않는다.
+    """
+    keywords = [k for k in keywords if k]
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+# 시장마다 키워드 80여 개를 하나씩 `in` 검사하는 대신 텍스트를 한 번만 훑는다
+_SPORTS_PATTERN = _substring_pattern(SPORTS_KEYWORDS)
+# market dict에 memo해 두는 소문자 question+slug 텍스트의 키
+_SCREEN_TEXT_KEY = "_text_lc"
+# market dict에 memo해 두는 get_high_probability_outcome 결과의 키
+_OUTCOME_KEY = "_high_probability_outcome"
+# excluded_categories 조합 -> 컴파일된 패턴 (한 사이클 동안 같은 조합이 반복된다)
+_EXCLUDED_PATTERNS: Dict[Collection[str], Optional[Pattern]] = {}
+
+
+class ExcludedCategories(frozenset):
+    """`lowercase_categories`가 만든, 이미 소문자화된 제외 카테고리 집합.
+
+    일반 frozenset과 구분해야 대소문자가 섞인 설정값을 정규화된 것으로
+    착각하지 않는다. 직접 만들지 말고 `lowercase_categories`를 쓴다.
+    """
+
+    __slots__ = ()
+
+
+def _excluded_pattern(excluded_categories: Collection[str]) -> Optional[Pattern]:
+    """excluded_categories의 소문자 부분 문자열 패턴 (조합별 캐시).
+
+    `ExcludedCategories`는 해시를 객체에 캐시하므로 그대로 키로 쓰면 시장마다
+    tuple을 새로 만들고 해시할 필요가 없다.
+    """
+    if isinstance(excluded_categories, ExcludedCategories):
+        key = excluded_categories
+    else:
+        key = tuple(excluded_categories)
+    try:
+        return _EXCLUDED_PATTERNS[key]
+    except KeyError:
+        pattern = _substring_pattern(category.lower() for category in key)
+        _EXCLUDED_PATTERNS[key] = pattern
+        return pattern
+
+
+def lowercase_categories(categories: Collection[str]) -> ExcludedCategories:
+    """Normalize category names to the lowercase set the tag check compares against.
+
+    이미 이 함수로 만든 `ExcludedCategories`만 그대로 돌려주므로, 스캔 루프
+    밖에서 한 번 만들어 넘기면 시장마다 다시 소문자화하지 않는다. 그 밖의
+    컨테이너(list, 일반 frozenset 등)는 항상 소문자화한다.
+    """
+    if isinstance(categories, ExcludedCategories):
+        return categories
+    return ExcludedCategories(category.lower() for category in categories)
+
+
+def is_sports_market(market: Dict, excluded_categories: Collection[str]) -> bool:
     """Check if market is sports-related.
 
     Checks:
@@ -32,7 +94,8 @@ def is_sports_market(market: Dict, excluded_categories: List[str]) -> bool:
 
     Args:
         market: Market dictionary
-        excluded_categories: List of category names to exclude
+        excluded_categories: Category names to exclude, or the precomputed
+            `ExcludedCategories` from `lowercase_categories`
 
     Returns:
         True if market should be excluded (is sports-related)
@@ -43,29 +106,29 @@ def is_sports_market(market: Dict, excluded_categories: List[str]) -> bool:
         return True
 
     # Check question and slug for sports keywords
-    question = market.get("question", "").lower()
-    slug = market.get("slug", "").lower()
-    text_to_check = f"{question} {slug}"
+    # 두 필드를 이어 붙인 뒤 한 번만 소문자화하고, 같은 market dict를 다시
+    # 검사하는 스냅샷 저장/매수 스캔이 재사용하도록 dict에 기억해 둔다
+    text_to_check = market.get(_SCREEN_TEXT_KEY)
+    if text_to_check is None:
+        text_to_check = f"{market.get('question', '')} {market.get('slug', '')}".lower()
+        market[_SCREEN_TEXT_KEY] = text_to_check
 
     # Check excluded categories as keywords
-    for category in excluded_categories:
-        if category.lower() in text_to_check:
-            return True
+    excluded_pattern = _excluded_pattern(excluded_categories)
+    if excluded_pattern is not None and excluded_pattern.search(text_to_check):
+        return True
 
     # Check sports keywords
-    for keyword in SPORTS_KEYWORDS:
-        if keyword in text_to_check:
-            return True
-
-    return False
+    return _SPORTS_PATTERN.search(text_to_check) is not None
 
 
-def is_sports_category(tags: List, excluded_categories: List[str]) -> bool:
+def is_sports_category(tags: List, excluded_categories: Collection[str]) -> bool:
     """Check if market belongs to sports or excluded category.
 
     Args:
         tags: List of tag dictionaries or strings from market
-        excluded_categories: List of category names to exclude
+        excluded_categories: Category names to exclude, or the precomputed
+            `ExcludedCategories` from `lowercase_categories`
 
     Returns:
         True if market should be excluded (is sports/excluded)
@@ -74,7 +137,7 @@ def is_sports_category(tags: List, excluded_categories: List[str]) -> bool:
         return False
 
     # Normalize excluded categories to lowercase for comparison
-    excluded_lower = [cat.lower() for cat in excluded_categories]
+    excluded_lower = lowercase_categories(excluded_categories)
 
     for tag in tags:
         # Handle both dict format and string format
@@ -118,6 +181,16 @@ def get_high_probability_outcome(market: Dict) -> Dict:
         - token_id: string
         - token_index: 0 or 1
     """
+    # 스냅샷 저장과 매수 스캔이 같은 market dict를 보므로 결과를 한 번만 계산한다
+    cached = market.get(_OUTCOME_KEY)
+    if cached is None:
+        cached = _high_probability_outcome(market)
+        market[_OUTCOME_KEY] = cached
+    return cached
+
+
+def _high_probability_outcome(market: Dict) -> Dict:
+    """get_high_probability_outcome의 계산 본체 (memo 없음)."""
     outcome_prices = market.get("outcomePrices", [])
     token_ids = market.get("clobTokenIds", [])
     outcomes = market.get("outcomes", ["Yes", "No"])
@@ -9,19 +9,36 @@
 데드크로스: 단기 모멘텀 - 장기 모멘텀 <= -threshold (청산 시그널)
 """
 import logging
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import List, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple, Union
+from sqlalchemy import Row
 from ..db.models import MarketSnapshot
 from ..config import MomentumConfig
 
 logger = logging.getLogger(__name__)
 
+# 계산에는 `timestamp`/`probability` 두 컬럼만 쓰므로 ORM 행 대신
+# repository의 컬럼 전용 select 결과 행(Row)을 그대로 받는다.
+SnapshotSequence = Sequence[Union[Row, MarketSnapshot]]
+
 # Jenkins는 5분 주기로 스냅샷을 저장한다. 개수만 맞고 같은 시각대에 몰린
 # 데이터로 15분/6시간 신호를 만들지 않도록 명목 구간의 90%를 요구한다.
 SNAPSHOT_INTERVAL_MINUTES = 5
 MIN_WINDOW_TIME_COVERAGE = 0.90
 
 
+@dataclass(frozen=True)
+class MomentumContext:
+    """한 사이클에서 마켓 하나에 대해 한 번만 계산한 모멘텀 결과.
+
+    스캐너 → 매수, 청산 판단 → 매도 기록이 스냅샷을 다시 조회하지
+    않고 이 값을 넘겨받아 재사용한다. 스냅샷 리스트 자체는 들고 있지 않는다.
+    """
+    short_momentum: Optional[float]
+    long_momentum: Optional[float]
+
+
 class MomentumCalculator:
     """마켓 모멘텀 계산기.
 
@@ -36,8 +53,27 @@ class MomentumCalculator:
             config: 모멘텀 설정 (short_window, long_window, thresholds)
         """
         self.config = config
+        # 윈도우 크기와 임계값은 실행 중 바뀌지 않으므로(frozen config) 생성 시
+        # 한 번 꺼내 두고, 윈도우별 최소 시간 커버리지도 미리 계산한다.
+        self._short_window = config.short_window
+        self._long_window = config.long_window
+        self._golden_cross_threshold = config.golden_cross_threshold
+        self._dead_cross_threshold = config.dead_cross_threshold
+        self._expected_spans = {
+            window: self._expected_span(window)
+            for window in (self._short_window, self._long_window)
+        }
+
+    @staticmethod
+    def _expected_span(required_points: int) -> timedelta:
+        """required_points개 스냅샷이 덮어야 하는 최소 시간 구간."""
+        return timedelta(
+            minutes=(required_points - 1)
+            * SNAPSHOT_INTERVAL_MINUTES
+            * MIN_WINDOW_TIME_COVERAGE
+        )
 
-    def calculate_momentum(self, snapshots: List[MarketSnapshot]) -> Optional[float]:
+    def calculate_momentum(self, snapshots: SnapshotSequence) -> Optional[float]:
         """스냅샷 리스트로부터 모멘텀 계산.
 
         모멘텀 = (최신 확률 - 가장 오래된 확률) / 스냅샷 수
@@ -50,44 +86,79 @@ class MomentumCalculator:
         """
         if not snapshots or len(snapshots) < 2:
             return None
+        return self._tail_momentum(snapshots, len(snapshots))
 
-        oldest = snapshots[0].probability
-        newest = snapshots[-1].probability
-
-        # 0으로 나누기 방지
-        if len(snapshots) == 0:
-            return None
-
-        return (newest - oldest) / len(snapshots)
+    @staticmethod
+    def _tail_momentum(snapshots: SnapshotSequence, window: int) -> float:
+        """최근 window개 구간의 모멘텀을 양 끝점만으로 계산 (슬라이스 생성 없음)."""
+        return (snapshots[-1].probability - snapshots[-window].probability) / window
 
     @staticmethod
     def _has_window_coverage(
-        snapshots: List[MarketSnapshot],
+        snapshots: SnapshotSequence,
         required_points: int,
     ) -> bool:
         """Require both the configured sample count and its intended time span."""
-        if required_points < 2 or len(snapshots) < required_points:
+        count = len(snapshots)
+        if required_points < 2 or count < required_points:
             return False
 
-        window = snapshots[-required_points:]
-        if any(snapshot.timestamp is None for snapshot in window):
-            return False
-        if any(
-            later.timestamp <= earlier.timestamp
-            for earlier, later in zip(window, window[1:])
-        ):
+        start = count - required_points
+        first = previous = snapshots[start].timestamp
+        if first is None:
             return False
+        for index in range(start + 1, count):
+            current = snapshots[index].timestamp
+            if current is None or current <= previous:
+                return False
+            previous = current
 
-        expected_span = timedelta(
-            minutes=(required_points - 1)
-            * SNAPSHOT_INTERVAL_MINUTES
-            * MIN_WINDOW_TIME_COVERAGE
-        )
-        return window[-1].timestamp - window[0].timestamp >= expected_span
+        return previous - first >= MomentumCalculator._expected_span(required_points)
+
+    def _compute_momenta(
+        self,
+        snapshots: SnapshotSequence,
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """단기/장기 모멘텀을 tail 한 번 순회로 함께 계산.
+
+        `get_short_momentum`과 `get_long_momentum`을 따로 부르면 단기 구간의
+        timestamp를 두 번 검사한다. 여기서는 끝에서부터 timestamp가 엄격히
+        증가하는 구간 길이를 한 번만 구한 뒤, 각 윈도우의 개수·시간 커버리지
+        조건을 그 길이와 양 끝점으로 판정한다. 결과는 두 메서드와 같다.
+        """
+        count = len(snapshots)
+        short_window = self._short_window
+        long_window = self._long_window
+        limit = min(max(short_window, long_window), count)
+        if limit < 2:
+            return None, None
+
+        newest = snapshots[-1].timestamp
+        run = 0
+        if newest is not None:
+            run = 1
+            newer = newest
+            for index in range(count - 2, count - limit - 1, -1):
+                current = snapshots[index].timestamp
+                if current is None or current >= newer:
+                    break
+                newer = current
+                run += 1
+
+        expected_spans = self._expected_spans
+
+        def covered(window: int) -> Optional[float]:
+            if window < 2 or run < window:
+                return None
+            if newest - snapshots[-window].timestamp < expected_spans[window]:
+                return None
+            return self._tail_momentum(snapshots, window)
+
+        return covered(short_window), covered(long_window)
 
     def get_short_momentum(
         self,
-        snapshots: List[MarketSnapshot]
+        snapshots: SnapshotSequence
     ) -> Optional[float]:
         """단기(15분) 모멘텀 계산.
 
@@ -99,14 +170,14 @@ class MomentumCalculator:
         Returns:
             단기 모멘텀 값 또는 None
         """
-        short_window = self.config.short_window
+        short_window = self._short_window
         if not self._has_window_coverage(snapshots, short_window):
             return None
-        return self.calculate_momentum(snapshots[-short_window:])
+        return self._tail_momentum(snapshots, short_window)
 
     def get_long_momentum(
         self,
-        snapshots: List[MarketSnapshot]
+        snapshots: SnapshotSequence
     ) -> Optional[float]:
         """장기(6시간) 모멘텀 계산.
 
@@ -119,10 +190,10 @@ class MomentumCalculator:
         Returns:
             장기 모멘텀 값 또는 None
         """
-        long_window = self.config.long_window
+        long_window = self._long_window
         if not self._has_window_coverage(snapshots, long_window):
             return None
-        return self.calculate_momentum(snapshots[-long_window:])
+        return self._tail_momentum(snapshots, long_window)
 
     def detect_golden_cross(
         self,
@@ -144,7 +215,7 @@ class MomentumCalculator:
             return False
 
         diff = short_momentum - long_momentum
-        return diff >= self.config.golden_cross_threshold
+        return diff >= self._golden_cross_threshold
 
     def detect_dead_cross(
         self,
@@ -166,11 +237,11 @@ class MomentumCalculator:
             return False
 
         diff = short_momentum - long_momentum
-        return diff <= self.config.dead_cross_threshold
+        return diff <= self._dead_cross_threshold
 
     def get_entry_signal(
         self,
-        snapshots: List[MarketSnapshot],
+        snapshots: SnapshotSequence,
         current_probability: float
     ) -> Tuple[bool, str]:
         """진입 시그널 판단.
@@ -186,22 +257,79 @@ class MomentumCalculator:
         Returns:
             (진입 여부, 사유)
         """
+        entry, reason, _, _ = self.get_entry_decision(snapshots, current_probability)
+        return entry, reason
+
+    def get_entry_decision(
+        self,
+        snapshots: SnapshotSequence,
+        current_probability: float
+    ) -> Tuple[bool, str, Optional[float], Optional[float]]:
+        """진입 시그널과 그 판단에 쓴 모멘텀을 한 번의 계산으로 반환.
+
+        스캐너가 시그널 판단과 분석 로그를 위해 같은 윈도우를 두 번
+        계산하지 않도록 `get_entry_signal`의 본체를 노출한다.
+
+        Args:
+            snapshots: 시간순 정렬된 스냅샷 리스트
+            current_probability: 현재 확률
+
+        Returns:
+            (진입 여부, 사유, 단기 모멘텀, 장기 모멘텀)
+        """
         if not self.config.enabled:
-            return True, "momentum_disabled"
+            return True, "momentum_disabled", None, None
+
+        short_mom, long_mom = self.get_momentum_info(snapshots)
+        entry, reason = self._classify_entry(short_mom, long_mom, len(snapshots))
+        return entry, reason, short_mom, long_mom
+
+    def get_entry_decisions(
+        self,
+        snapshots_by_condition: Dict[str, SnapshotSequence],
+    ) -> Dict[str, Tuple[bool, str, Optional[float], Optional[float]]]:
+        """여러 마켓의 진입 판단을 한 번에 계산.
+
+        스캐너가 후보마다 `get_entry_decision`을 부르는 대신, 한 번의 호출로
+        모든 후보의 모멘텀과 시그널을 구한다. 결과는 마켓별
+        `get_entry_decision`과 같다.
 
-        short_mom = self.get_short_momentum(snapshots)
-        long_mom = self.get_long_momentum(snapshots)
+        Args:
+            snapshots_by_condition: condition_id -> 시간순 스냅샷 시퀀스
 
+        Returns:
+            condition_id -> (진입 여부, 사유, 단기 모멘텀, 장기 모멘텀)
+        """
+        if not self.config.enabled:
+            disabled = (True, "momentum_disabled", None, None)
+            return {condition_id: disabled for condition_id in snapshots_by_condition}
+
+        decisions = {}
+        momentum_info = self.get_momentum_info
+        classify = self._classify_entry
+        for condition_id, snapshots in snapshots_by_condition.items():
+            short_mom, long_mom = momentum_info(snapshots)
+            entry, reason = classify(short_mom, long_mom, len(snapshots))
+            decisions[condition_id] = (entry, reason, short_mom, long_mom)
+        return decisions
+
+    def _classify_entry(
+        self,
+        short_mom: Optional[float],
+        long_mom: Optional[float],
+        snapshot_count: int,
+    ) -> Tuple[bool, str]:
+        """계산된 모멘텀으로 진입 여부와 사유를 판정."""
         # 단기 데이터도 부족한 경우
         if short_mom is None:
-            logger.debug(f"단기 모멘텀 데이터 부족 (스냅샷 {len(snapshots)}개)")
+            logger.debug("단기 모멘텀 데이터 부족 (스냅샷 %d개)", snapshot_count)
             return False, "insufficient_short_data"
 
         # 장기 윈도우가 부족하면 단기 양수여도 fail closed
         if long_mom is None:
             logger.debug(
-                f"장기 모멘텀 데이터/시간 커버리지 부족 "
-                f"(스냅샷 {len(snapshots)}개)"
+                "장기 모멘텀 데이터/시간 커버리지 부족 (스냅샷 %d개)",
+                snapshot_count,
             )
             return False, "insufficient_long_data"
 
@@ -210,86 +338,27 @@ class MomentumCalculator:
             # 장기 모멘텀 양수 필수 조건 확인
             if self.config.require_positive_long_momentum and long_mom <= 0:
                 logger.debug(
-                    f"골든크로스 감지되었으나 장기 모멘텀 음수로 진입 거부 - "
-                    f"단기: {short_mom:.6f}, 장기: {long_mom:.6f}"
+                    "골든크로스 감지되었으나 장기 모멘텀 음수로 진입 거부 - "
+                    "단기: %.6f, 장기: %.6f",
+                    short_mom, long_mom,
                 )
                 return False, "long_momentum_negative"
             logger.debug(
-                f"골든크로스 감지 - 단기: {short_mom:.6f}, 장기: {long_mom:.6f}, "
-                f"차이: {short_mom - long_mom:.6f}"
+                "골든크로스 감지 - 단기: %.6f, 장기: %.6f, 차이: %.6f",
+                short_mom, long_mom, short_mom - long_mom,
             )
             return True, "golden_cross"
 
         logger.debug(
-            f"진입 조건 미충족 - 단기: {short_mom:.6f}, 장기: {long_mom:.6f}, "
-            f"차이: {short_mom - long_mom:.6f} (필요: >= {self.config.golden_cross_threshold})"
+            "진입 조건 미충족 - 단기: %.6f, 장기: %.6f, 차이: %.6f (필요: >= %s)",
+            short_mom, long_mom, short_mom - long_mom,
+            self._golden_cross_threshold,
         )
         return False, "no_signal"
 
-    def get_exit_signal(
-        self,
-        snapshots: List[MarketSnapshot],
-        entry_price: float,
-        current_price: float,
-        take_profit: float,
-        stop_loss: float
-    ) -> Tuple[bool, str]:
-        """청산 시그널 판단.
-
-        우선순위:
-        1. 손절: 진입가 대비 손실이 stop_loss 이하
-        2. 이익실현: 진입가 대비 수익이 take_profit 이상
-        3. 데드크로스: 모멘텀 역전
-
-        Args:
-            snapshots: 시간순 정렬된 스냅샷 리스트
-            entry_price: 진입가
-            current_price: 현재가
-            take_profit: 이익실현 임계값 (예: 0.07 = +7%)
-            stop_loss: 손절 임계값 (예: -0.10 = -10%)
-
-        Returns:
-            (청산 여부, 사유)
-        """
-        # P&L 계산
-        if entry_price == 0:
-            pnl_percent = 0
-        else:
-            pnl_percent = (current_price - entry_price) / entry_price
-
-        # 1. 손절 체크
-        if pnl_percent <= stop_loss:
-            logger.info(
-                f"손절 조건 충족 - 진입: {entry_price:.2%}, 현재: {current_price:.2%}, "
-                f"손실: {pnl_percent:.2%}"
-            )
-            return True, "stop_loss"
-
-        # 2. 이익실현 체크
-        if pnl_percent >= take_profit:
-            logger.info(
-                f"이익실현 조건 충족 - 진입: {entry_price:.2%}, 현재: {current_price:.2%}, "
-                f"수익: {pnl_percent:.2%}"
-            )
-            return True, "take_profit"
-
-        # 3. 모멘텀 청산 체크
-        if self.config.enabled:
-            short_mom = self.get_short_momentum(snapshots)
-            long_mom = self.get_long_momentum(snapshots)
-
-            if short_mom is not None and long_mom is not None:
-                if self.detect_dead_cross(short_mom, long_mom):
-                    logger.info(
-                        f"데드크로스 감지 - 단기: {short_mom:.6f}, 장기: {long_mom:.6f}"
-                    )
-                    return True, "dead_cross"
-
-        return False, "hold"
-
     def get_momentum_info(
         self,
-        snapshots: List[MarketSnapshot]
+        snapshots: SnapshotSequence
     ) -> Tuple[Optional[float], Optional[float]]:
         """현재 모멘텀 정보 조회.
 
@@ -299,7 +368,4 @@ class MomentumCalculator:
         Returns:
             (단기 모멘텀, 장기 모멘텀)
         """
-        return (
-            self.get_short_momentum(snapshots),
-            self.get_long_momentum(snapshots)
-        )
+        return self._compute_momenta(snapshots)
@@ -1,23 +1,37 @@
 """Market scanner for finding trading opportunities."""
 import logging
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
 from ..api.gamma_client import GammaClient
 from ..config import TradingConfig
 from ..db.repository import TradeRepository
 from .filters import (
     is_sports_market,
-    passes_liquidity_filter,
+    lowercase_categories,
     get_high_probability_outcome,
     is_valid_buy_candidate,
 )
-from .momentum import MomentumCalculator
+from .momentum import MomentumCalculator, MomentumContext
 
 logger = logging.getLogger(__name__)
 
 _NUMERIC_REASON_PART = re.compile(r"^[+-]?\d[\d.]*[a-z%]*$")
 
 
+class MomentumAnalysisRow(NamedTuple):
+    """스캔 요약 로그용 시장별 모멘텀 분석 결과 한 줄."""
+
+    question: str
+    outcome: str
+    probability: float
+    short_momentum: Optional[float]
+    long_momentum: Optional[float]
+    diff: Optional[float]
+    entry_signal: bool
+    reason: str
+    snapshot_count: int
+
+
 def _reason_key(reason: str) -> str:
     """제외 사유의 수치 접미사를 떼고 집계 키로 정규화.
 
@@ -63,7 +77,7 @@ class MarketScanner:
         if config.momentum.enabled:
             self.momentum_calc = MomentumCalculator(config.momentum)
 
-    def _log_momentum_summary(self, analysis: List[Dict]):
+    def _log_momentum_summary(self, analysis: List[MomentumAnalysisRow]):
         """모멘텀 분석 요약 출력.
 
         Args:
@@ -87,23 +101,21 @@ class MarketScanner:
 
         logger.info("-" * 70)
 
-        entry_count = 0
-        for item in analysis:
-            status = "✓ 진입" if item["entry_signal"] else "✗ 제외"
-            if item["entry_signal"]:
-                entry_count += 1
-
-            short = f"{item['short_momentum']:.6f}" if item['short_momentum'] is not None else "N/A"
-            long_m = f"{item['long_momentum']:.6f}" if item['long_momentum'] is not None else "N/A"
-            diff = f"{item['diff']:+.6f}" if item['diff'] is not None else "N/A"
-
-            snapshot_cnt = item.get('snapshot_count', 0)
-            logger.info(
-                f"{status} | {item['outcome']} @ {item['probability']:.1%} | "
-                f"스냅샷: {snapshot_cnt}개 | 단기: {short} | 장기: {long_m} | 차이: {diff} | "
-                f"사유: {item['reason']}"
-            )
-            logger.info(f"       {item['question']}...")
+        entry_count = sum(1 for item in analysis if item.entry_signal)
+        # 시장별 두 줄씩 찍는 본문은 INFO가 꺼져 있으면 문자열을 만들지도 않는다
+        if logger.isEnabledFor(logging.INFO):
+            for item in analysis:
+                status = "✓ 진입" if item.entry_signal else "✗ 제외"
+                short = f"{item.short_momentum:.6f}" if item.short_momentum is not None else "N/A"
+                long_m = f"{item.long_momentum:.6f}" if item.long_momentum is not None else "N/A"
+                diff = f"{item.diff:+.6f}" if item.diff is not None else "N/A"
+
+                logger.info(
+                    "%s | %s @ %.1f%% | 스냅샷: %d개 | 단기: %s | 장기: %s | 차이: %s | 사유: %s",
+                    status, item.outcome, item.probability * 100,
+                    item.snapshot_count, short, long_m, diff, item.reason,
+                )
+                logger.info("       %s...", item.question)
 
         logger.info("-" * 70)
         logger.info(f"요약: 총 {len(analysis)}개 시장 중 {entry_count}개 진입 가능")
@@ -121,11 +133,13 @@ class MarketScanner:
     ) -> List[Dict]:
         """Scan for markets meeting buy criteria.
 
-        Criteria:
-        1. Not in excluded categories (sports)
-        2. Liquidity >= min_liquidity
-        3. Probability: buy_threshold <= prob <= sell_threshold
-        4. Momentum: Golden cross (if enabled)
+        Criteria (cheapest and most selective first, snapshot lookup last):
+        1. Probability: buy_threshold <= prob <= sell_threshold
+        2. Not in excluded categories (sports)
+        3. Momentum: Golden cross (if enabled)
+
+        Liquidity >= min_liquidity is already enforced by the Gamma sweep
+        in `fetch_markets`, so it is not re-checked here.
 
         Returns:
             List of candidate dictionaries with market info
@@ -134,43 +148,64 @@ class MarketScanner:
             markets = self.fetch_markets()
         logger.info(f"시장 {len(markets)}개 스캔 시작")
 
+        # 루프 안에서는 설정 속성 대신 지역 변수만 읽는다.
+        config = self.config
+        buy_threshold = config.buy_threshold
+        sell_threshold = config.sell_threshold
+        excluded = lowercase_categories(config.excluded_categories)
+        momentum_calc = self.momentum_calc if self.repo else None
+
         candidates = []
         momentum_analysis = []  # 모멘텀 분석 결과 저장
         rejected = {}  # 사유 키 -> 개수 (요약 로그용)
+        eligible = []  # 확률/카테고리 조건을 통과한 (market, condition_id, outcome_info)
 
         for market in markets:
             condition_id = market.get("conditionId")
             if not condition_id:
                 continue
 
-            # Filter: Excluded categories (sports)
-            if is_sports_market(market, self.config.excluded_categories):
-                logger.debug(f"스포츠 시장 제외: {condition_id}")
-                rejected["excluded_category"] = rejected.get("excluded_category", 0) + 1
-                continue
-
-            # Filter: Liquidity (double check)
-            if not passes_liquidity_filter(market, self.config.min_liquidity):
-                rejected["low_liquidity"] = rejected.get("low_liquidity", 0) + 1
-                continue
-
+            # 숫자 비교뿐인 확률 범위가 대부분의 시장을 걸러내므로 먼저 본다
             # Get high probability outcome
             outcome_info = get_high_probability_outcome(market)
             if not outcome_info or not outcome_info.get("token_id"):
                 rejected["no_price_data"] = rejected.get("no_price_data", 0) + 1
                 continue
 
-            probability = outcome_info["probability"]
-
             # Filter: Probability in valid buy range (85% <= prob <= 97%)
             if not is_valid_buy_candidate(
-                probability,
-                self.config.buy_threshold,
-                self.config.sell_threshold,
+                outcome_info["probability"],
+                buy_threshold,
+                sell_threshold,
             ):
                 rejected["prob_out_of_range"] = rejected.get("prob_out_of_range", 0) + 1
                 continue
 
+            # Filter: Excluded categories (sports) - 텍스트 검사는 확률 범위 통과분만
+            if is_sports_market(market, excluded):
+                logger.debug("스포츠 시장 제외: %s", condition_id)
+                rejected["excluded_category"] = rejected.get("excluded_category", 0) + 1
+                continue
+
+            eligible.append((market, condition_id, outcome_info))
+
+        # 저렴한 필터를 모두 통과한 시장의 window만 bulk 쿼리 한 번으로 읽는다
+        # 후보 전체의 진입 판단도 한 번의 batch 호출로 끝낸다
+        snapshots_by_condition = {}
+        decisions = {}
+        if momentum_calc and eligible:
+            snapshots_by_condition = self.repo.get_snapshot_windows(
+                [condition_id for _, condition_id, _ in eligible],
+                config.momentum.long_window + 10,
+            )
+            decisions = momentum_calc.get_entry_decisions(snapshots_by_condition)
+
+        for market, condition_id, outcome_info in eligible:
+            # 행마다 여러 번 읽는 필드는 한 번씩만 꺼낸다
+            probability = outcome_info["probability"]
+            outcome = outcome_info["outcome"]
+            question = market.get("question", "")
+
             # Filter: Momentum signal (if enabled)
             entry_signal = True
             entry_reason = "momentum_disabled"
@@ -178,55 +213,56 @@ class MarketScanner:
             long_momentum = None
 
             snapshot_count = 0
-            if self.momentum_calc and self.repo:
-                # Get snapshots for momentum calculation
-                snapshots = self.repo.get_snapshots_for_condition(
-                    condition_id,
-                    limit=self.config.momentum.long_window + 10
-                )
+            momentum_ctx = None
+            if momentum_calc:
+                snapshots = snapshots_by_condition.get(condition_id, [])
                 snapshot_count = len(snapshots)
 
                 # 디버깅: 스냅샷 확률 값 확인
-                if snapshots and len(snapshots) >= 2:
-                    oldest_prob = snapshots[0].probability
-                    newest_prob = snapshots[-1].probability
-                    oldest_time = snapshots[0].timestamp
-                    newest_time = snapshots[-1].timestamp
+                if snapshot_count >= 2 and logger.isEnabledFor(logging.INFO):
+                    oldest = snapshots[0]
+                    newest = snapshots[-1]
                     logger.info(
-                        f"[SNAPSHOT] {condition_id[:16]}... | "
-                        f"oldest: {oldest_prob:.6f} ({oldest_time}) | "
-                        f"newest: {newest_prob:.6f} ({newest_time}) | "
-                        f"diff: {newest_prob - oldest_prob:.6f}"
+                        "[SNAPSHOT] %s... | oldest: %.6f (%s) | "
+                        "newest: %.6f (%s) | diff: %.6f",
+                        condition_id[:16],
+                        oldest.probability, oldest.timestamp,
+                        newest.probability, newest.timestamp,
+                        newest.probability - oldest.probability,
                     )
 
-                entry_signal, entry_reason = self.momentum_calc.get_entry_signal(
-                    snapshots, probability
-                )
-                # 모멘텀 정보 수집
-                short_momentum, long_momentum = self.momentum_calc.get_momentum_info(snapshots)
+                # 시그널 판단과 분석 로그가 같은 모멘텀 계산을 공유한다
+                (
+                    entry_signal,
+                    entry_reason,
+                    short_momentum,
+                    long_momentum,
+                ) = decisions[condition_id]
+                momentum_ctx = MomentumContext(short_momentum, long_momentum)
 
             # 모멘텀 분석 결과 저장 (진입 여부와 관계없이)
             diff = None
             if short_momentum is not None and long_momentum is not None:
                 diff = short_momentum - long_momentum
 
-            momentum_analysis.append({
-                "question": market.get("question", "")[:50],
-                "outcome": outcome_info["outcome"],
-                "probability": probability,
-                "short_momentum": short_momentum,
-                "long_momentum": long_momentum,
-                "diff": diff,
-                "entry_signal": entry_signal,
-                "reason": entry_reason,
-                "snapshot_count": snapshot_count,
-            })
+            momentum_analysis.append(MomentumAnalysisRow(
+                question[:50],
+                outcome,
+                probability,
+                short_momentum,
+                long_momentum,
+                diff,
+                entry_signal,
+                entry_reason,
+                snapshot_count,
+            ))
 
             if not entry_signal:
                 key = _reason_key(entry_reason)
                 rejected[key] = rejected.get(key, 0) + 1
+                # %.20s: 자르기도 DEBUG가 켜졌을 때만 일어나도록 포맷에 맡긴다
                 logger.debug(
-                    f"모멘텀 조건 미충족: {condition_id[:20]}... ({entry_reason})"
+                    "모멘텀 조건 미충족: %.20s... (%s)", condition_id, entry_reason
                 )
                 continue
 
@@ -239,19 +275,22 @@ class MarketScanner:
             candidate = {
                 "condition_id": condition_id,
                 "market_slug": market.get("slug", ""),
-                "question": market.get("question", ""),
-                "outcome": outcome_info["outcome"],
+                "question": question,
+                "outcome": outcome,
                 "probability": probability,
                 "token_id": outcome_info["token_id"],
                 "liquidity": float(market.get("liquidity") or 0),
                 "entry_reason": entry_reason,  # 진입 사유 추가
                 "market_tags": market_tags,
+                "momentum_ctx": momentum_ctx,  # 매수 시 스냅샷 재조회 방지
             }
             candidates.append(candidate)
-            logger.debug(
-                f"매수 후보: {candidate['question'][:50]}... "
-                f"({candidate['outcome']} @ {probability:.1%}, 사유: {entry_reason})"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "매수 후보: %s... (%s @ %.1f%%, 사유: %s)",
+                    question[:50], outcome,
+                    probability * 100, entry_reason,
+                )
 
         # 모멘텀 분석 요약 출력
         self._log_momentum_summary(momentum_analysis)
@@ -279,6 +318,8 @@ class MarketScanner:
             markets = self.fetch_markets()
 
         saved = 0
+        # 매수 스캔과 같은 정규화 경로로, 시장마다가 아니라 루프 밖에서 한 번만
+        excluded = lowercase_categories(self.config.excluded_categories)
         try:
             for market in markets:
                 condition_id = market.get("conditionId")
@@ -286,7 +327,7 @@ class MarketScanner:
                     continue
 
                 # Skip sports markets
-                if is_sports_market(market, self.config.excluded_categories):
+                if is_sports_market(market, excluded):
                     continue
 
                 # Get probability
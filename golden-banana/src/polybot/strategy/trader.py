@@ -2,15 +2,15 @@
 import logging
 import math
 import re
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
 from polybot_observability import SubmissionEvidenceError
 
 from ..db.repository import TradeRepository
 from ..db.models import TradeStatus
 from ..api.clob_client import ClobClientWrapper
 from ..config import TradingConfig
-from .momentum import MomentumCalculator
+from .momentum import MomentumCalculator, MomentumContext
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +103,57 @@ def is_zero_balance_error(result: dict) -> bool:
     return bool(_ZERO_BALANCE_PATTERN.search(str(result.get("error", ""))))
 
 
+def exit_distance(
+    buy_price: float,
+    price: Optional[float],
+    sell_threshold: float,
+    stop_loss: float,
+    take_profit: float,
+) -> float:
+    """현재가가 가장 가까운 가격 청산선(threshold/손절/이익실현)까지 남은 거리.
+
+    음수면 이미 청산 조건을 넘은 것이다. 가격을 모르면 맨 뒤로 보낸다(inf).
+    """
+    if price is None:
+        return math.inf
+    distance = sell_threshold - price
+    if buy_price > 0:
+        distance = min(
+            distance,
+            price - buy_price * (1 + stop_loss),
+            buy_price * (1 + take_profit) - price,
+        )
+    return distance
+
+
+def order_holdings_by_exit_proximity(
+    holdings: List,
+    prices: Optional[Mapping[str, Optional[float]]],
+    config: TradingConfig,
+) -> List:
+    """청산 가능성이 높은 포지션부터 처리하도록 정렬한다 (추가 RPC 없음).
+
+    사이클이 중간에 끊겨도(SIGTERM, rate limit) 급한 매도가 먼저 제출되도록
+    Phase 1의 batch midpoint snapshot 가격으로 `exit_distance` 오름차순 정렬한다.
+    snapshot이 없으면 DB 순서를 그대로 둔다.
+    """
+    if not prices or len(holdings) < 2:
+        return holdings
+    sell_threshold = config.sell_threshold
+    stop_loss = config.stop_loss_percent
+    take_profit = config.take_profit_percent
+    return sorted(
+        holdings,
+        key=lambda trade: exit_distance(
+            trade.buy_price,
+            prices.get(str(trade.token_id).strip()),
+            sell_threshold,
+            stop_loss,
+            take_profit,
+        ),
+    )
+
+
 class Trader:
     """Executes buy and sell orders based on momentum strategy rules."""
 
@@ -123,31 +174,117 @@ class Trader:
         self.clob = clob_client
         self.config = config
 
+        # 매수/매도 판단마다 읽는 설정값은 생성 시 한 번만 꺼내 둔다
+        # (TradingConfig는 실행 중에 바뀌지 않고, Trader는 사이클마다 새로 만든다)
+        self._max_positions = config.max_positions
+        self._buy_threshold = config.buy_threshold
+        self._sell_threshold = config.sell_threshold
+        self._buy_amount_usdc = config.buy_amount_usdc
+        self._stop_loss = config.stop_loss_percent
+        self._take_profit = config.take_profit_percent
+
         # Initialize momentum calculator if enabled
         self.momentum_calc = None
+        self._snapshot_window_size = 0
         if config.momentum.enabled:
             self.momentum_calc = MomentumCalculator(config.momentum)
+            self._snapshot_window_size = config.momentum.long_window + 10
+
+        # tick(사이클) 단위 DB 집계 캐시. bot은 사이클마다 Trader를 새로 만들므로
+        # 인스턴스 수명이 곧 tick이다.
+        # HOLDING 수: 매수 후보마다 COUNT 쿼리를 보내지 않도록 처음 한 번만 읽고,
+        # 이 Trader가 상태를 바꿀 때마다 직접 갱신한다.
+        self._position_count_cache: Optional[int] = None
+        # condition_id -> 거래/skip 여부. `prefetch_traded_ids`가 후보 전체를 IN 쿼리
+        # 한 번으로 채우고, 미리 받지 못한 시장만 `is_already_traded`로 개별 조회한다.
+        self._traded_ids_cache: Dict[str, bool] = {}
+        # condition_id -> 모멘텀 계산용 스냅샷 창. `prefetch_momentum_windows`가
+        # 보유 포지션 전체를 한 번에 채우고, 없는 시장만 개별 조회한다.
+        self._momentum_windows: Dict[str, List[Any]] = {}
+
+    def _record_time(self) -> datetime:
+        """DB에 남길 시각: 기록하는 순간의 naive UTC (DB 컬럼 규약과 동일).
+
+        buy/sell_timestamp는 실제 제출 시각으로 execution ledger 백필과 기간
+        집계에 쓰이므로 사이클 시작 시각으로 뭉개지 않고 매번 시계를 읽는다.
+        """
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def _get_position_count(self) -> int:
+        """현재 HOLDING 수 (tick 당 DB 조회 최대 1회)."""
+        if self._position_count_cache is None:
+            self._position_count_cache = self.repo.get_position_count()
+        return self._position_count_cache
 
-    def _get_momentum_info(
+    def prefetch_traded_ids(self, condition_ids: Iterable[str]) -> Set[str]:
+        """후보들의 거래/skip 여부를 batch로 받아 두고, 이미 거래한 id 집합을 돌려준다.
+
+        bot은 이 결과로 후보를 거르고, 이후 `execute_buy`의 재확인은 같은 값을
+        메모리에서 읽는다 (후보마다 trades/skipped_markets 쿼리를 보내지 않는다).
+        """
+        condition_ids = list(condition_ids)
+        traded = self.repo.get_already_traded_ids(condition_ids)
+        for condition_id in condition_ids:
+            self._traded_ids_cache[condition_id] = condition_id in traded
+        return traded
+
+    def _is_already_traded(self, condition_id: str) -> bool:
+        """미리 받은 값이 있으면 쓰고, 없으면 DB에 한 번 묻고 기억한다."""
+        traded = self._traded_ids_cache.get(condition_id)
+        if traded is None:
+            traded = self.repo.is_already_traded(condition_id)
+            self._traded_ids_cache[condition_id] = traded
+        return traded
+
+    def _mark_traded(self, condition_id: str) -> None:
+        """이 Trader가 거래/skip을 기록한 시장은 같은 tick에서 다시 사지 않는다."""
+        self._traded_ids_cache[condition_id] = True
+
+    def prefetch_momentum_windows(self, condition_ids: Iterable[str]) -> None:
+        """매도 판단할 시장들의 스냅샷 창을 batch 쿼리 한 번으로 받아 둔다.
+
+        가격만으로 결정되는 청산은 창을 쓰지 않지만, dead cross 확인이 필요한
+        포지션마다 창 쿼리를 보내는 것보다 한 번에 읽는 편이 싸다.
+        """
+        if not self.momentum_calc:
+            return
+        condition_ids = [
+            cid for cid in dict.fromkeys(condition_ids)
+            if cid not in self._momentum_windows
+        ]
+        if condition_ids:
+            self._momentum_windows.update(
+                self.repo.get_snapshot_windows(condition_ids, self._snapshot_window_size)
+            )
+
+    def _adjust_position_count(self, delta: int) -> None:
+        """이 Trader가 HOLDING을 만들거나 닫았을 때 캐시를 맞춘다."""
+        if self._position_count_cache is not None:
+            self._position_count_cache = max(0, self._position_count_cache + delta)
+
+    def _get_momentum_context(
         self,
         condition_id: str
-    ) -> tuple[Optional[float], Optional[float]]:
-        """Get momentum info for a market.
+    ) -> Optional[MomentumContext]:
+        """Compute a market's momentum from its prefetched (or freshly read) window.
 
         Args:
             condition_id: Market condition ID
 
         Returns:
-            (short_momentum, long_momentum) or (None, None)
+            MomentumContext, or None when momentum is disabled
         """
         if not self.momentum_calc:
-            return None, None
+            return None
 
-        snapshots = self.repo.get_snapshots_for_condition(
-            condition_id,
-            limit=self.config.momentum.long_window + 10
-        )
-        return self.momentum_calc.get_momentum_info(snapshots)
+        snapshots = self._momentum_windows.get(condition_id)
+        if snapshots is None:
+            snapshots = self.repo.get_snapshot_windows(
+                [condition_id], self._snapshot_window_size
+            )[condition_id]
+            self._momentum_windows[condition_id] = snapshots
+        short_momentum, long_momentum = self.momentum_calc.get_momentum_info(snapshots)
+        return MomentumContext(short_momentum, long_momentum)
 
     def execute_buy(self, candidate: dict) -> Optional[int]:
         """Execute a buy order for a candidate market.
@@ -162,53 +299,59 @@ class Trader:
                 - market_slug
                 - liquidity
                 - entry_reason (optional)
+                - momentum_ctx (optional, scanner가 계산한 MomentumContext)
 
         Returns:
             Trade ID if successful, None otherwise
         """
         condition_id = candidate["condition_id"]
         token_id = candidate["token_id"]
+        max_positions = self._max_positions
+        sell_threshold = self._sell_threshold
+        buy_threshold = self._buy_threshold
+        buy_amount_usdc = self._buy_amount_usdc
 
         # Check: Already traded?
-        if self.repo.is_already_traded(condition_id):
-            logger.info(f"이미 거래한 시장: {condition_id}")
+        if self._is_already_traded(condition_id):
+            logger.info("이미 거래한 시장: %s", condition_id)
             return None
 
         # Check: Max positions limit
-        if self.config.max_positions > 0:
-            current_positions = self.repo.get_position_count()
-            if current_positions >= self.config.max_positions:
-                logger.info(f"최대 포지션 수 ({self.config.max_positions}) 도달")
+        if max_positions > 0:
+            current_positions = self._get_position_count()
+            if current_positions >= max_positions:
+                logger.info("최대 포지션 수 (%d) 도달", max_positions)
                 return None
 
         # Get current price (re-verify before buying)
         try:
             current_price = self.clob.get_midpoint(token_id)
         except Exception as e:
-            logger.warning(f"가격 조회 실패 - condition: {condition_id}: {e}")
+            logger.warning("가격 조회 실패 - condition: %s: %s", condition_id, e)
             return None
 
         # Check: Price jumped above sell threshold?
         # Note: sell_threshold 초과 시에만 skip (97% 이하는 진입 가능)
-        if current_price > self.config.sell_threshold:
+        if current_price > sell_threshold:
             logger.info(
-                f"급등 감지 - 매수 skip: {condition_id} "
-                f"(가격: {current_price:.1%} > 매도 기준 {self.config.sell_threshold:.1%})"
+                "급등 감지 - 매수 skip: %s (가격: %.1f%% > 매도 기준 %.1f%%)",
+                condition_id, current_price * 100, sell_threshold * 100,
             )
             self.repo.mark_as_skipped(condition_id, "rapid_jump")
+            self._mark_traded(condition_id)
             return None
 
         # Check: Price dropped below buy threshold?
-        if current_price < self.config.buy_threshold:
+        if current_price < buy_threshold:
             logger.info(
-                f"가격 하락으로 매수 조건 미충족: {condition_id} "
-                f"(가격: {current_price:.1%} < 매수 기준 {self.config.buy_threshold:.1%})"
+                "가격 하락으로 매수 조건 미충족: %s (가격: %.1f%% < 매수 기준 %.1f%%)",
+                condition_id, current_price * 100, buy_threshold * 100,
             )
             return None
 
         # Calculate order size
         # shares = USDC amount / price
-        buy_shares = self.config.buy_amount_usdc / current_price
+        buy_shares = buy_amount_usdc / current_price
 
         # Check minimum order size (Polymarket requires at least 5 shares)
         if buy_shares < MIN_ORDER_SIZE:
@@ -218,14 +361,18 @@ class Trader:
             )
             return None
 
-        # Get momentum info for logging and storage
-        short_momentum, long_momentum = self._get_momentum_info(condition_id)
+        # Get momentum info for logging and storage (scanner 계산 재사용)
+        momentum_ctx = candidate.get("momentum_ctx")
+        if momentum_ctx is None:
+            momentum_ctx = self._get_momentum_context(condition_id)
+        short_momentum = momentum_ctx.short_momentum if momentum_ctx else None
+        long_momentum = momentum_ctx.long_momentum if momentum_ctx else None
         entry_reason = candidate.get("entry_reason", "unknown")
 
         # Place order
         logger.info(
             f"매수: {candidate['outcome']} - '{candidate['question'][:50]}...' "
-            f"@ {current_price:.2%} ({buy_shares:.2f}주, ${self.config.buy_amount_usdc}) "
+            f"@ {current_price:.2%} ({buy_shares:.2f}주, ${buy_amount_usdc}) "
             f"[사유: {entry_reason}]"
         )
 
@@ -246,10 +393,10 @@ class Trader:
                 outcome=candidate["outcome"],
                 token_id=token_id,
                 buy_price=current_price,
-                buy_amount=self.config.buy_amount_usdc,
+                buy_amount=buy_amount_usdc,
                 buy_shares=buy_shares,
                 buy_order_id=result.get("orderID"),
-                buy_timestamp=datetime.utcnow(),
+                buy_timestamp=self._record_time(),
                 buy_probability=current_price,
                 liquidity_at_buy=candidate["liquidity"],
                 market_tags=candidate.get("market_tags", ""),
@@ -260,6 +407,9 @@ class Trader:
                 long_momentum_at_buy=long_momentum,
             )
 
+            self._adjust_position_count(+1)
+            self._mark_traded(condition_id)
+
             logger.info(f"매수 주문 완료: Trade #{trade.id}, Order: {result.get('orderID')}")
             return trade.id
         else:
@@ -338,9 +488,9 @@ class Trader:
 
         청산 조건 (우선순위 순):
         1. 확률 >= sell_threshold (97%)
-        2. 진입가 대비 +7% (이익실현)
-        3. 진입가 대비 -10% (손절)
-        4. 데드크로스 (모멘텀 역전)
+        2. 진입가 대비 -10% (손절)
+        3. 진입가 대비 +7% (이익실현)
+        4. 데드크로스 (모멘텀 역전) - 가격 조건이 모두 빗나갔을 때만 스냅샷 조회
 
         Args:
             trade: Trade object from DB
@@ -350,63 +500,71 @@ class Trader:
         """
         token_id = trade.token_id
         condition_id = trade.condition_id
+        buy_price = trade.buy_price
+        sell_threshold = self._sell_threshold
 
         # Get current price
         try:
             current_price = self.clob.get_midpoint(token_id)
         except Exception as e:
-            logger.warning(f"가격 조회 실패 - condition: {condition_id}: {e}")
+            logger.warning("가격 조회 실패 - condition: %s: %s", condition_id, e)
             return False
 
-        # Determine exit signal and reason
-        should_sell = False
-        exit_reason = "hold"
+        # P&L은 한 번만 계산하고, 값싼 가격 비교부터 하나의 분기 사슬로 판단한다.
+        # 스냅샷 조회 + 모멘텀 계산은 가격 조건이 모두 빗나간 경우에만 한다.
+        pnl_percent = (current_price - buy_price) / buy_price if buy_price > 0 else 0.0
+        momentum_ctx = None
+        should_sell = True
 
         # 1. Check probability threshold (기존 방식)
-        if current_price >= self.config.sell_threshold:
-            should_sell = True
+        if current_price >= sell_threshold:
             exit_reason = "threshold"
             logger.info(
                 f"확률 기준 충족 - 매도: {condition_id} "
-                f"(가격: {current_price:.1%} >= {self.config.sell_threshold:.1%})"
+                f"(가격: {current_price:.1%} >= {sell_threshold:.1%})"
             )
-
-        # 2-4. Check momentum-based exit conditions
-        elif self.momentum_calc:
-            snapshots = self.repo.get_snapshots_for_condition(
-                condition_id,
-                limit=self.config.momentum.long_window + 10
+        # 2. 손절
+        elif pnl_percent <= self._stop_loss:
+            exit_reason = "stop_loss"
+            logger.info(
+                f"손절 조건 충족 - 매도: {condition_id} "
+                f"(진입: {buy_price:.2%}, 현재: {current_price:.2%}, 손실: {pnl_percent:.1%})"
             )
-            should_sell, exit_reason = self.momentum_calc.get_exit_signal(
-                snapshots,
-                entry_price=trade.buy_price,
-                current_price=current_price,
-                take_profit=self.config.take_profit_percent,
-                stop_loss=self.config.stop_loss_percent,
+        # 3. 이익실현
+        elif pnl_percent >= self._take_profit:
+            exit_reason = "take_profit"
+            logger.info(
+                f"이익실현 조건 충족 - 매도: {condition_id} "
+                f"(진입: {buy_price:.2%}, 현재: {current_price:.2%}, 수익: {pnl_percent:.1%})"
             )
+        # 4. 데드크로스 (모멘텀 활성화 시에만)
         else:
-            # Momentum disabled: check price-based stop-loss and take-profit only
-            if trade.buy_price > 0:
-                pnl_percent = (current_price - trade.buy_price) / trade.buy_price
-                if pnl_percent <= self.config.stop_loss_percent:
-                    should_sell = True
-                    exit_reason = "stop_loss"
-                    logger.info(
-                        f"손절 조건 충족 - 매도: {condition_id} "
-                        f"(손실: {pnl_percent:.1%})"
-                    )
-                elif pnl_percent >= self.config.take_profit_percent:
-                    should_sell = True
-                    exit_reason = "take_profit"
-                    logger.info(
-                        f"이익실현 조건 충족 - 매도: {condition_id} "
-                        f"(수익: {pnl_percent:.1%})"
-                    )
+            should_sell = False
+            exit_reason = "hold"
+            momentum_ctx = self._get_momentum_context(condition_id)
+            if (
+                momentum_ctx is not None
+                and momentum_ctx.short_momentum is not None
+                and momentum_ctx.long_momentum is not None
+                and self.momentum_calc.detect_dead_cross(
+                    momentum_ctx.short_momentum, momentum_ctx.long_momentum
+                )
+            ):
+                should_sell = True
+                exit_reason = "dead_cross"
+                logger.info(
+                    "데드크로스 감지 - 매도: %s (단기: %.6f, 장기: %.6f)",
+                    condition_id,
+                    momentum_ctx.short_momentum,
+                    momentum_ctx.long_momentum,
+                )
 
         if not should_sell:
             logger.debug(
-                f"보유 유지: {condition_id} "
-                f"(가격: {current_price:.1%}, 사유: {exit_reason})"
+                "보유 유지: %s (가격: %.1f%%, 사유: %s)",
+                condition_id,
+                current_price * 100,
+                exit_reason,
             )
             return False
 
@@ -426,11 +584,14 @@ class Trader:
         if result.get("success") or result.get("orderID"):
             # Calculate P&L
             sell_value = current_price * sell_shares
-            buy_value = trade.buy_price * sell_shares
+            buy_value = buy_price * sell_shares
             realized_pnl = sell_value - buy_value
 
-            # Get momentum info at sell
-            short_momentum, long_momentum = self._get_momentum_info(condition_id)
+            # Momentum info at sell (청산 판단 때 조회했으면 그 값을 재사용)
+            if momentum_ctx is None:
+                momentum_ctx = self._get_momentum_context(condition_id)
+            short_momentum = momentum_ctx.short_momentum if momentum_ctx else None
+            long_momentum = momentum_ctx.long_momentum if momentum_ctx else None
 
             # Update trade record
             self.repo.update_trade(
@@ -438,7 +599,7 @@ class Trader:
                 sell_price=current_price,
                 sell_shares=sell_shares,
                 sell_order_id=result.get("orderID"),
-                sell_timestamp=datetime.utcnow(),
+                sell_timestamp=self._record_time(),
                 sell_probability=current_price,
                 realized_pnl=realized_pnl,
                 status=TradeStatus.COMPLETED,
@@ -447,8 +608,9 @@ class Trader:
                 short_momentum_at_sell=short_momentum,
                 long_momentum_at_sell=long_momentum,
             )
+            self._adjust_position_count(-1)
 
-            pnl_percent = (current_price / trade.buy_price - 1) * 100 if trade.buy_price > 0 else 0
+            pnl_percent = (current_price / buy_price - 1) * 100 if buy_price > 0 else 0
             logger.info(
                 f"매도 주문 완료: Trade #{trade.id}, "
                 f"P&L: ${realized_pnl:.4f} ({pnl_percent:.1f}%), "
@@ -497,6 +659,7 @@ class Trader:
             status=TradeStatus.UNFILLED,
             exit_reason="buy_unfilled",
         )
+        self._adjust_position_count(-1)
         logger.warning(
             f"유령 포지션 마감 [UNFILLED]: Trade #{trade.id} "
             f"'{trade.question[:50]}...' - 매수 GTC 미체결 확인 (지갑 잔고 0). "
@@ -514,8 +677,18 @@ class Trader:
 
         logger.info(f"보유 포지션 {len(holdings)}개 확인 중")
 
-        for trade in holdings:
-            if self.execute_sell(trade):
-                sold_count += 1
+        if not holdings:
+            return sold_count
+
+        # 보유 포지션 가격과 스냅샷 창을 batch로 받아 두고 매도 판단은 로컬에서 한다
+        self.prefetch_momentum_windows(trade.condition_id for trade in holdings)
+        with self.clob.midpoint_snapshot(
+            trade.token_id for trade in holdings
+        ) as prices:
+            for trade in order_holdings_by_exit_proximity(
+                holdings, prices, self.config
+            ):
+                if self.execute_sell(trade):
+                    sold_count += 1
 
         return sold_count
@@ -1,4 +1,5 @@
 """Strict resolved-configuration validation tests."""
+import dataclasses
 import os
 
 import pytest
@@ -96,3 +97,12 @@ def test_yaml_numeric_types_are_strict(tmp_path, yaml_text, match):
     path.write_text(yaml_text, encoding="utf-8")
     with pytest.raises(ValueError, match=match):
         load_config(str(path))
+
+
+def test_resolved_config_is_frozen(monkeypatch):
+    monkeypatch.setenv("POLYBOT_MOMENTUM_LONG_WINDOW", "48")
+    config = load_config("missing.yaml")
+
+    assert config.trading.momentum.long_window == 48
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.trading.buy_threshold = 0.5
@@ -56,6 +56,9 @@ def test_cycle_shares_one_gamma_sweep_between_snapshot_and_scan(monkeypatch):
     bot.config = SimpleNamespace(
         trading=SimpleNamespace(
             min_liquidity=50_000,
+            buy_threshold=0.85,
+            sell_threshold=0.97,
+            excluded_categories=[],
             momentum=SimpleNamespace(enabled=False),
             lifecycle_mode="active",
         )
@@ -117,8 +120,49 @@ def test_snapshot_rows_commit_once_per_cycle():
     assert all(row["commit"] is False for row in repository.rows)
 
 
+def test_snapshot_pass_and_buy_scan_share_mixed_case_category_screen():
+    class SnapshotRepository:
+        def __init__(self):
+            self.saved = []
+
+        def save_snapshot(self, **kwargs):
+            self.saved.append(kwargs["condition_id"])
+
+        def commit(self):
+            pass
+
+    def market(condition_id, tags):
+        return {
+            "conditionId": condition_id,
+            "question": "Will it happen?",
+            "tags": tags,
+            "outcomes": ["Yes", "No"],
+            "outcomePrices": ["0.9", "0.1"],
+            "clobTokenIds": [f"{condition_id}-yes", f"{condition_id}-no"],
+        }
+
+    repository = SnapshotRepository()
+    scanner = MarketScanner(
+        FakeGamma(),
+        SimpleNamespace(
+            # 대소문자가 섞인 설정값이 일반 frozenset으로 들어와도 정규화돼야 한다
+            excluded_categories=frozenset({"Esports"}),
+            buy_threshold=0.85,
+            sell_threshold=0.97,
+            min_liquidity=0,
+            momentum=SimpleNamespace(enabled=False),
+        ),
+        repository,
+    )
+    markets = [market("tagged", [{"slug": "esports"}]), market("plain", [])]
+
+    assert scanner.save_market_snapshots(markets) == 1
+    assert repository.saved == ["plain"]
+    assert [c["condition_id"] for c in scanner.scan_buy_candidates(markets)] == ["plain"]
+
+
 def test_cycle_scopes_batch_midpoints_to_nonempty_sell_phase(monkeypatch):
-    holding = SimpleNamespace(token_id="holding-token")
+    holding = SimpleNamespace(token_id="holding-token", condition_id="holding-market")
 
     class HoldingRepository(FakeRepository):
         def get_holding_trades(self):
@@ -142,6 +186,9 @@ def test_cycle_scopes_batch_midpoints_to_nonempty_sell_phase(monkeypatch):
         def __init__(self, _repo, clob, _config):
             self.clob = clob
 
+        def prefetch_momentum_windows(self, condition_ids):
+            assert list(condition_ids) == [holding.condition_id]
+
         def execute_sell(self, trade):
             assert trade is holding
             assert self.clob.active is True
@@ -161,6 +208,9 @@ def test_cycle_scopes_batch_midpoints_to_nonempty_sell_phase(monkeypatch):
     bot.config = SimpleNamespace(
         trading=SimpleNamespace(
             min_liquidity=50_000,
+            buy_threshold=0.85,
+            sell_threshold=0.97,
+            excluded_categories=[],
             momentum=SimpleNamespace(enabled=False),
             lifecycle_mode="active",
         )
@@ -172,3 +222,79 @@ def test_cycle_scopes_batch_midpoints_to_nonempty_sell_phase(monkeypatch):
     assert clob.active is False
     assert stats["checked_holdings"] == 1
     assert stats["sold"] == 1
+
+
+def test_cycle_batches_buy_midpoints_for_untraded_candidates(monkeypatch):
+    candidates = [
+        {"condition_id": "traded", "token_id": "traded-token"},
+        {"condition_id": "fresh", "token_id": "fresh-token"},
+    ]
+
+    class CandidateScanner:
+        def __init__(self, *_args):
+            pass
+
+        def fetch_markets(self):
+            return []
+
+        def save_market_snapshots(self, _markets):
+            return 0
+
+        def scan_buy_candidates(self, _markets):
+            return candidates
+
+    class TradedRepository(FakeRepository):
+        def get_already_traded_ids(self, condition_ids):
+            assert condition_ids == ["traded", "fresh"]
+            return {"traded"}
+
+    class SnapshotClob:
+        def __init__(self):
+            self.active = False
+            self.requested = []
+
+        @contextmanager
+        def midpoint_snapshot(self, token_ids):
+            self.requested = list(token_ids)
+            self.active = True
+            try:
+                yield {}
+            finally:
+                self.active = False
+
+    class BuyingTrader:
+        def __init__(self, repo, clob, _config):
+            self.repo = repo
+            self.clob = clob
+
+        def prefetch_traded_ids(self, condition_ids):
+            return self.repo.get_already_traded_ids(condition_ids)
+
+        def execute_buy(self, candidate):
+            assert candidate["condition_id"] == "fresh"
+            assert self.clob.active is True
+            return 1
+
+    repository = TradedRepository()
+    clob = SnapshotClob()
+    monkeypatch.setattr(bot_module, "TradeRepository", lambda _session: repository)
+    monkeypatch.setattr(bot_module, "MarketScanner", CandidateScanner)
+    monkeypatch.setattr(bot_module, "Trader", BuyingTrader)
+
+    bot = PolymarketBot.__new__(PolymarketBot)
+    bot.Session = FakeSession
+    bot.gamma = FakeGamma()
+    bot.clob = clob
+    bot.config = SimpleNamespace(
+        trading=SimpleNamespace(
+            momentum=SimpleNamespace(enabled=False),
+            lifecycle_mode="active",
+        )
+    )
+
+    stats = bot.run_cycle()
+
+    assert clob.requested == ["fresh-token"]
+    assert clob.active is False
+    assert stats["buy_candidates"] == 2
+    assert stats["bought"] == 1
@@ -0,0 +1,54 @@
+"""Sports/excluded-category screening keeps plain substring semantics."""
+from polybot.strategy.filters import (
+    SPORTS_KEYWORDS,
+    is_sports_category,
+    is_sports_market,
+    lowercase_categories,
+)
+
+
+def _substring_reference(market, excluded_categories):
+    text = f"{market.get('question', '').lower()} {market.get('slug', '').lower()}"
+    return any(c.lower() in text for c in excluded_categories) or any(
+        k in text for k in SPORTS_KEYWORDS
+    )
+
+
+def test_keyword_screen_matches_substring_checks():
+    markets = [
+        {"question": "Will the Fed cut rates?", "slug": "fed-cut"},
+        {"question": "Will an endgame deal pass?", "slug": "policy"},
+        {"question": "Bitcoin above 100k?", "slug": "btc-100k"},
+        {"question": "Who wins the F1 title?", "slug": "f1-title"},
+        {"question": "Esports (LoL) worlds winner", "slug": "lol-worlds"},
+    ]
+
+    for excluded in ([], ["Esports", "Crypto"], ["esports"]):
+        for market in markets:
+            assert is_sports_market(market, excluded) == _substring_reference(
+                market, excluded
+            )
+    assert is_sports_market({"question": "Tag only", "tags": [{"slug": "esports"}]}, ["Esports"])
+
+
+def test_precomputed_lowercase_categories_screen_like_the_raw_list():
+    excluded = ["Esports", "Crypto"]
+    lowered = lowercase_categories(excluded)
+    for market in (
+        {"question": "Tag only", "tags": [{"label": "ESPORTS"}]},
+        {"question": "Plain", "tags": ["crypto"]},
+        {"question": "Bitcoin crypto rally?"},
+        {"question": "Fed cut?", "tags": [{"slug": "politics"}]},
+    ):
+        assert is_sports_market(dict(market), lowered) == is_sports_market(
+            dict(market), excluded
+        )
+
+
+def test_plain_frozenset_is_lowercased_like_any_other_container():
+    mixed = frozenset({"Sports", "NFL"})
+    assert is_sports_category(["sports"], mixed) == is_sports_category(["sports"], ["Sports"])
+    assert is_sports_market({"question": "x", "tags": ["nfl"]}, mixed)
+    assert lowercase_categories(mixed) == {"sports", "nfl"}
+    normalized = lowercase_categories(["Sports"])
+    assert lowercase_categories(normalized) is normalized
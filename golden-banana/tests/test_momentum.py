@@ -71,3 +71,39 @@ def test_fully_covered_short_and_long_windows_can_emit_golden_cross():
     assert calc.get_short_momentum(points) is not None
     assert calc.get_long_momentum(points) is not None
     assert calc.get_entry_signal(points, 0.68) == (True, "golden_cross")
+
+
+def test_entry_decision_reports_the_momenta_it_decided_on():
+    calc = MomentumCalculator(MomentumConfig(short_window=3, long_window=72))
+    points = snapshots(80, 395, start=0.50, end=0.58)
+
+    entry, reason, short_mom, long_mom = calc.get_entry_decision(points, 0.58)
+
+    assert (entry, reason) == calc.get_entry_signal(points, 0.58)
+    assert (short_mom, long_mom) == calc.get_momentum_info(points)
+    assert short_mom == calc.calculate_momentum(points[-3:])
+    assert long_mom == calc.calculate_momentum(points[-72:])
+    batch = calc.get_entry_decisions({"covered": points, "cold": points[-6:]})
+    assert batch["covered"] == (entry, reason, short_mom, long_mom)
+    assert batch["cold"] == calc.get_entry_decision(points[-6:], 0.58)
+
+
+def test_fused_momenta_match_the_per_window_calculations():
+    calc = MomentumCalculator(MomentumConfig(short_window=3, long_window=72))
+    out_of_order = snapshots(80, 395)
+    out_of_order[-10].timestamp = out_of_order[-2].timestamp
+    cases = [
+        snapshots(80, 395),
+        snapshots(71, 350),
+        snapshots(72, 200),
+        out_of_order,
+        snapshots(1, 0),
+        [],
+    ]
+
+    for points in cases:
+        assert calc._compute_momenta(points) == (
+            calc.get_short_momentum(points),
+            calc.get_long_momentum(points),
+        )
+
@@ -0,0 +1,152 @@
+"""Repository query/maintenance behavior against a real SQLite database."""
+from datetime import datetime, timedelta
+
+import pytest
+
+import polybot.db.repository as repository_module
+from polybot.db.models import MarketSnapshot, init_database
+from polybot.db.repository import TradeRepository
+
+
+@pytest.fixture
+def session(tmp_path):
+    session = init_database(str(tmp_path / "trades.db"))()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def test_cleanup_deletes_old_snapshots_in_committed_batches(session, monkeypatch):
+    monkeypatch.setattr(repository_module, "SNAPSHOT_DELETE_BATCH_SIZE", 3)
+    stale = datetime.utcnow() - timedelta(days=8)
+    session.add_all(
+        MarketSnapshot(condition_id="old", probability=0.9, timestamp=stale)
+        for _ in range(7)
+    )
+    session.add(MarketSnapshot(condition_id="fresh", probability=0.9))
+    session.commit()
+
+    assert TradeRepository(session).cleanup_old_snapshots(days=7) == 7
+    assert [row.condition_id for row in session.query(MarketSnapshot)] == ["fresh"]
+
+
+def test_cleanup_vacuums_on_accumulated_free_pages_not_per_call_deletes(
+    session, monkeypatch
+):
+    monkeypatch.setattr(repository_module, "SNAPSHOT_VACUUM_PAGES", 10)
+    repo = TradeRepository(session)
+    stale = datetime.utcnow() - timedelta(days=8)
+    session.add_all(
+        MarketSnapshot(condition_id=f"old-{index}", probability=0.9, timestamp=stale)
+        for index in range(3000)
+    )
+    session.commit()
+
+    def freelist():
+        return session.execute(repository_module.text("PRAGMA freelist_count")).scalar()
+
+    # freelist가 기준 미만이면 free page를 그대로 둔다
+    monkeypatch.setattr(repository_module, "SNAPSHOT_VACUUM_MIN_FREE_PAGES", 10_000)
+    assert repo.cleanup_old_snapshots(days=7) == 3000
+    free_pages = freelist()
+    assert free_pages > 10
+
+    # 이번 호출에 지운 행이 없어도 누적 freelist가 기준을 넘으면 정해진 만큼 반환한다
+    monkeypatch.setattr(repository_module, "SNAPSHOT_VACUUM_MIN_FREE_PAGES", 5)
+    assert repo.cleanup_old_snapshots(days=7) == 0
+    assert freelist() == free_pages - 10
+
+
+def test_new_database_uses_incremental_auto_vacuum(session):
+    assert session.execute(repository_module.text("PRAGMA auto_vacuum")).scalar() == 2
+
+
+def test_bulk_snapshot_tails_match_per_condition_queries(session):
+    start = datetime(2026, 7, 11, 12, 0, 0)
+    for condition_id, count in (("a", 5), ("b", 2)):
+        session.add_all(
+            MarketSnapshot(
+                condition_id=condition_id,
+                probability=0.80 + index / 100,
+                timestamp=start + timedelta(minutes=5 * index),
+            )
+            for index in range(count)
+        )
+    session.commit()
+    repo = TradeRepository(session)
+
+    tails = repo.get_snapshots_for_conditions(["a", "b", "missing", "a"], limit=3)
+
+    assert set(tails) == {"a", "b"}
+    for condition_id, rows in tails.items():
+        expected = repo.get_snapshots_for_condition(condition_id, limit=3)
+        assert [(row.timestamp, row.probability) for row in rows] == [
+            (snapshot.timestamp, snapshot.probability) for snapshot in expected
+        ]
+    assert [row.probability for row in tails["a"]] == pytest.approx([0.82, 0.83, 0.84])
+
+
+def test_snapshot_windows_return_latest_points_for_every_requested_market(session):
+    start = datetime(2026, 7, 11, 12, 0, 0)
+    session.add_all(
+        MarketSnapshot(
+            condition_id="a",
+            probability=0.80 + index / 100,
+            timestamp=start + timedelta(minutes=5 * index),
+        )
+        for index in range(4)
+    )
+    session.commit()
+    repo = TradeRepository(session)
+
+    windows = repo.get_snapshot_windows(["a", "empty"], 3)
+    assert [p.probability for p in windows["a"]] == pytest.approx([0.81, 0.82, 0.83])
+    assert windows["empty"] == []
+
+    # 저장 직후 조회에도 새 행이 바로 보인다 (메모리 상태 없음)
+    repo.save_snapshot("a", 0.9)
+    assert repo.get_snapshot_windows(["a"], 2)["a"][-1].probability == pytest.approx(0.9)
+
+
+def test_already_traded_ids_cover_trades_and_skipped_markets(session):
+    repo = TradeRepository(session)
+    repo.create_trade(
+        condition_id="bought", market_slug="s", question="q", outcome="Yes",
+        token_id="t", buy_price=0.9, buy_amount=5.0, buy_shares=5.5,
+    )
+    repo.mark_as_skipped("jumped", "rapid_jump")
+
+    ids = ["bought", "jumped", "fresh", "bought"]
+    assert repo.get_already_traded_ids(ids) == {"bought", "jumped"}
+    assert {cid for cid in ids if repo.is_already_traded(cid)} == {"bought", "jumped"}
+
+
+def test_holding_summary_rows_carry_status_columns_only_for_holdings(session):
+    repo = TradeRepository(session)
+    held = repo.create_trade(
+        condition_id="held", market_slug="s", question="q", outcome="Yes",
+        token_id="t", buy_price=0.9, buy_amount=5.0, buy_shares=5.5,
+        entry_reason="golden_cross", status=repository_module.TradeStatus.HOLDING,
+    )
+    repo.create_trade(
+        condition_id="done", market_slug="s", question="q", outcome="No",
+        token_id="u", buy_price=0.9, buy_amount=5.0, buy_shares=5.5,
+        status=repository_module.TradeStatus.COMPLETED,
+    )
+
+    rows = repo.get_holding_trades_summary()
+
+    assert [(row.id, row.condition_id, row.entry_reason) for row in rows] == [
+        (held.id, "held", "golden_cross")
+    ]
+
+
+def test_simulation_database_keeps_incremental_auto_vacuum_without_pooling(tmp_path):
+    factory = init_database(str(tmp_path / "sim.db"), simulation_mode=True)
+    session = factory()
+    try:
+        assert factory.kw["bind"].pool.__class__.__name__ == "NullPool"
+        assert session.execute(repository_module.text("PRAGMA auto_vacuum")).scalar() == 2
+    finally:
+        session.close()
@@ -0,0 +1,225 @@
+"""Trader bookkeeping: per-tick DB aggregates are read once, cheap exits first."""
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from types import SimpleNamespace
+
+from polybot.config import MomentumConfig
+from polybot.db.models import MarketSnapshot
+import polybot.strategy.trader as trader_module
+from polybot.strategy.trader import Trader, order_holdings_by_exit_proximity
+
+
+class CountingRepository:
+    def __init__(self, holding=0):
+        self.holding = holding
+        self.count_queries = 0
+        self.traded_queries = 0
+        self.ids = count(1)
+        self.created = []
+
+    def get_already_traded_ids(self, condition_ids):
+        self.traded_queries += 1
+        return {cid for cid in condition_ids if cid in self.created}
+
+    def is_already_traded(self, condition_id):
+        self.traded_queries += 1
+        return condition_id in self.created
+
+    def get_position_count(self):
+        self.count_queries += 1
+        return self.holding
+
+    def create_trade(self, **kwargs):
+        self.created.append(kwargs["condition_id"])
+        self.last_kwargs = kwargs
+        return SimpleNamespace(id=next(self.ids))
+
+
+class FilledClob:
+    def get_midpoint(self, token_id):
+        return 0.90
+
+    def place_limit_order(self, *, token_id, price, size, side):
+        return {"success": True, "orderID": f"SIM-{token_id}"}
+
+
+def _config(max_positions, momentum=None):
+    return SimpleNamespace(
+        max_positions=max_positions,
+        sell_threshold=0.97,
+        buy_threshold=0.85,
+        buy_amount_usdc=10.0,
+        stop_loss_percent=-0.10,
+        take_profit_percent=0.07,
+        momentum=momentum or SimpleNamespace(enabled=False),
+    )
+
+
+def _candidate(index):
+    return {
+        "condition_id": f"condition-{index}",
+        "token_id": f"token-{index}",
+        "outcome": "Yes",
+        "question": "Will it happen?",
+        "market_slug": f"market-{index}",
+        "liquidity": 50_000.0,
+    }
+
+
+def test_position_limit_reads_count_once_per_tick_and_tracks_buys():
+    repo = CountingRepository(holding=1)
+    trader = Trader(repo, FilledClob(), _config(max_positions=3))
+
+    results = [trader.execute_buy(_candidate(index)) for index in range(4)]
+
+    # 1개 보유 + 2건 매수 = 3개에서 한도에 걸리고, COUNT 쿼리는 한 번뿐이다
+    assert results == [1, 2, None, None]
+    assert repo.count_queries == 1
+
+    # 다음 사이클은 새 Trader가 다시 한 번만 읽는다
+    repo.holding = 0
+    trader = Trader(repo, FilledClob(), _config(max_positions=3))
+    assert trader.execute_buy(_candidate(9)) == 3
+    assert repo.count_queries == 2
+
+
+def test_already_traded_recheck_reuses_the_prefetched_batch():
+    repo = CountingRepository()
+    repo.created.append("condition-0")
+    trader = Trader(repo, FilledClob(), _config(max_positions=0))
+
+    ids = [_candidate(index)["condition_id"] for index in range(3)]
+    assert trader.prefetch_traded_ids(ids) == {"condition-0"}
+    assert [trader.execute_buy(_candidate(index)) for index in range(3)] == [None, 1, 2]
+    # 방금 매수한 시장은 같은 tick 안에서 다시 조회하지 않아도 걸러진다
+    assert trader.execute_buy(_candidate(1)) is None
+    assert repo.traded_queries == 1
+
+
+def test_buy_timestamp_is_read_at_write_time_as_naive_utc(monkeypatch):
+    clock = iter([
+        datetime(2026, 7, 11, 12, 0, tzinfo=timezone.utc),
+        datetime(2026, 7, 11, 12, 0, 7, tzinfo=timezone.utc),
+    ])
+
+    class FixedClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            assert tz is timezone.utc
+            return next(clock)
+
+    monkeypatch.setattr(trader_module, "datetime", FixedClock)
+    repo = CountingRepository()
+    trader = Trader(repo, FilledClob(), _config(max_positions=0))
+
+    trader.execute_buy(_candidate(1))
+    first = repo.last_kwargs["buy_timestamp"]
+    trader.execute_buy(_candidate(2))
+
+    # 매수마다 시계를 다시 읽고, DB 규약대로 tzinfo 없이 저장한다
+    assert first == datetime(2026, 7, 11, 12, 0)
+    assert repo.last_kwargs["buy_timestamp"] == datetime(2026, 7, 11, 12, 0, 7)
+    assert first.tzinfo is None
+
+
+def test_holdings_closest_to_an_exit_line_are_checked_first():
+    config = SimpleNamespace(
+        sell_threshold=0.97, stop_loss_percent=-0.10, take_profit_percent=0.07
+    )
+    calm, stop, unknown, near_top = (
+        SimpleNamespace(token_id=token, buy_price=0.88)
+        for token in ("calm", "stop", "unknown", "near-top")
+    )
+    prices = {"calm": 0.88, "stop": 0.78, "unknown": None, "near-top": 0.935}
+
+    ordered = order_holdings_by_exit_proximity(
+        [calm, stop, unknown, near_top], prices, config
+    )
+
+    # 손절선 아래(이미 청산) -> 이익실현선 근접 -> 중간 -> 가격 미상
+    assert ordered == [stop, near_top, calm, unknown]
+    assert order_holdings_by_exit_proximity([calm, stop], None, config) == [calm, stop]
+
+
+def test_price_exits_decide_before_any_snapshot_lookup():
+    lookups = []
+    start = datetime(2026, 7, 11, 6, 0)
+
+    class WindowRepository:
+        def get_snapshot_windows(self, condition_ids, window_size):
+            lookups.append(list(condition_ids))
+            window = [
+                MarketSnapshot(
+                    timestamp=start + timedelta(minutes=5 * index),
+                    probability=0.70 - index * 0.001,
+                )
+                for index in range(80)
+            ]
+            return {cid: window for cid in condition_ids}
+
+    class PriceClob:
+        def __init__(self, price):
+            self.price = price
+
+        def get_midpoint(self, token_id):
+            return self.price
+
+    config = _config(0, MomentumConfig(short_window=3, long_window=72))
+    trade = SimpleNamespace(
+        id=1, token_id="t", condition_id="c", buy_price=0.80,
+        outcome="Yes", question="q", buy_shares=10.0,
+    )
+    trader = Trader(WindowRepository(), PriceClob(0.80), config)
+    trader._place_sell_with_balance_retry = lambda **kwargs: ({"success": False}, 0)
+
+    # 가격만 보고 보유 유지가 결정되지 않으면 그때 한 번 스냅샷을 본다
+    assert trader.execute_sell(trade) is False
+    assert lookups == [["c"]]
+
+    # 손절/이익실현은 스냅샷 조회 없이 결정된다 (주문 실패로 기록 단계엔 가지 않음)
+    for price in (0.70, 0.90):
+        lookups.clear()
+        trader.clob = PriceClob(price)
+        assert trader.execute_sell(trade) is False
+        assert lookups == []
+
+
+def test_check_and_sell_reads_every_holding_window_in_one_query():
+    lookups = []
+    start = datetime(2026, 7, 11, 6, 0)
+    holdings = [
+        SimpleNamespace(
+            id=index, token_id=f"t{index}", condition_id=f"c{index}", buy_price=0.80,
+            outcome="Yes", question="q", buy_shares=10.0,
+        )
+        for index in range(3)
+    ]
+
+    class HoldingWindowRepository:
+        def get_holding_trades(self):
+            return holdings
+
+        def get_snapshot_windows(self, condition_ids, window_size):
+            lookups.append(list(condition_ids))
+            window = [
+                MarketSnapshot(
+                    timestamp=start + timedelta(minutes=5 * index), probability=0.80
+                )
+                for index in range(80)
+            ]
+            return {cid: window for cid in condition_ids}
+
+    class SteadyClob(FilledClob):
+        def get_midpoint(self, token_id):
+            return 0.80
+
+        def midpoint_snapshot(self, token_ids):
+            return nullcontext({token_id: 0.80 for token_id in token_ids})
+
+    config = _config(0, MomentumConfig(short_window=3, long_window=72))
+    trader = Trader(HoldingWindowRepository(), SteadyClob(), config)
+
+    # 가격으로 결정되지 않는 세 포지션 모두 dead cross를 보지만 창 쿼리는 한 번
+    assert trader.check_and_sell_holdings() == 0
+    assert lookups == [["c0", "c1", "c2"]]